@@ -3,21 +3,83 @@
 Analyze API routes in a codebase and extract endpoint information.
 
 Usage:
-    python analyze_routes.py <path>
+    python analyze_routes.py <path> [--json] [--no-cache]
 
 Output:
     - Detected framework
     - List of all routes with methods, paths, and handlers
     - Middleware detected
     - Validation schemas found
+
+Routes extracted per file are cached under ~/.cache/api-docs/ keyed by
+(path, mtime, size), so re-running on a mostly unchanged repo only scans
+the files that changed. Pass --no-cache to bypass it.
 """
 
 import os
 import sys
 import json
 import re
+import bisect
+import hashlib
+import heapq
+import operator
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Below this many files a process pool costs more than it saves
+PARALLEL_MIN_FILES = 64
+
+# Threads used to read files ahead of the scanner
+READ_AHEAD_WORKERS = 16
+
+# Schema files past this size are bundles or generated code
+MAX_SCHEMA_FILE_SIZE = 1_000_000
+
+# On-disk route cache, one file per analyzed repo
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "api-docs"
+CACHE_MAX_ENTRIES = 20_000
+# Bump whenever extract_routes output changes so stale entries are ignored
+CACHE_VERSION = 4
+
+
+class Route(NamedTuple):
+    """
+    A route definition found in a source file.
+    
+    A named tuple rather than a dict: far smaller per route, immutable so
+    middleware tuples can be shared, and cheap to pickle across workers.
+    """
+    
+    method: str
+    path: str
+    file: str
+    line: int
+    middleware: Tuple[str, ...]
+    
+    def to_dict(self) -> Dict:
+        """Return the JSON-friendly form used in --json output and routes.json."""
+        return {
+            "method": self.method,
+            "path": self.path,
+            "file": self.file,
+            "line": self.line,
+            "middleware": list(self.middleware),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Route":
+        return cls(
+            sys.intern(data.get("method", "GET")),
+            data.get("path", ""),
+            sys.intern(data.get("file", "")),
+            data.get("line", 1),
+            tuple(data.get("middleware", ())),
+        )
+
 
 IGNORE_DIRS = {
     "node_modules", ".git", "__pycache__", ".next", ".nuxt",
@@ -25,35 +87,36 @@ IGNORE_DIRS = {
     ".idea", ".venv", "venv", "env"
 }
 
-# Route patterns by framework
+# Route patterns by framework. Files are scanned as one buffer, so every
+# pattern is kept from matching across a newline.
 ROUTE_PATTERNS = {
     "express": [
         # router.get('/path', handler)
-        r"(?:router|app)\.(get|post|put|patch|delete|all)\s*\(\s*['\"`]([^'\"`]+)['\"`]",
+        r"(?:router|app)\.(get|post|put|patch|delete|all)[ \t]*\([ \t]*['\"`]([^'\"`\n]+)['\"`]",
         # router.use('/prefix', routerName)
-        r"(?:router|app)\.use\s*\(\s*['\"`]([^'\"`]+)['\"`]\s*,\s*(\w+)",
+        r"(?:router|app)\.use[ \t]*\([ \t]*['\"`]([^'\"`\n]+)['\"`][ \t]*,[ \t]*(\w+)",
     ],
     "fastify": [
-        r"(?:fastify|app)\.(get|post|put|patch|delete)\s*\(\s*['\"`]([^'\"`]+)['\"`]",
+        r"(?:fastify|app)\.(get|post|put|patch|delete)[ \t]*\([ \t]*['\"`]([^'\"`\n]+)['\"`]",
     ],
     "hono": [
-        r"(?:app|router)\.(get|post|put|patch|delete)\s*\(\s*['\"`]([^'\"`]+)['\"`]",
+        r"(?:app|router)\.(get|post|put|patch|delete)[ \t]*\([ \t]*['\"`]([^'\"`\n]+)['\"`]",
     ],
     "fastapi": [
-        r"@(?:router|app)\.(get|post|put|patch|delete)\s*\(\s*['\"`]([^'\"`]+)['\"`]",
+        r"@(?:router|app)\.(get|post|put|patch|delete)[ \t]*\([ \t]*['\"`]([^'\"`\n]+)['\"`]",
     ],
     "flask": [
-        r"@(?:app|blueprint)\.route\s*\(\s*['\"`]([^'\"`]+)['\"`](?:.*?methods\s*=\s*\[([^\]]+)\])?",
+        r"@(?:app|blueprint)\.route[ \t]*\([ \t]*['\"`]([^'\"`\n]+)['\"`](?:.*?methods[ \t]*=[ \t]*\[([^\]\n]+)\])?",
     ],
     "django": [
-        r"path\s*\(\s*['\"`]([^'\"`]+)['\"`]",
-        r"url\s*\(\s*r?['\"`]([^'\"`]+)['\"`]",
+        r"path[ \t]*\([ \t]*['\"`]([^'\"`\n]+)['\"`]",
+        r"url[ \t]*\([ \t]*r?['\"`]([^'\"`\n]+)['\"`]",
     ],
     "gin": [
-        r"(?:router|r|group)\.(GET|POST|PUT|PATCH|DELETE)\s*\(\s*['\"`]([^'\"`]+)['\"`]",
+        r"(?:router|r|group)\.(GET|POST|PUT|PATCH|DELETE)[ \t]*\([ \t]*['\"`]([^'\"`\n]+)['\"`]",
     ],
     "echo": [
-        r"(?:e|echo|g)\.(GET|POST|PUT|PATCH|DELETE)\s*\(\s*['\"`]([^'\"`]+)['\"`]",
+        r"(?:e|echo|g)\.(GET|POST|PUT|PATCH|DELETE)[ \t]*\([ \t]*['\"`]([^'\"`\n]+)['\"`]",
     ],
 }
 
@@ -81,13 +144,106 @@ MIDDLEWARE_PATTERNS = {
     ],
 }
 
+# Validation schema patterns
+SCHEMA_PATTERNS = {
+    "zod": r"(?:export\s+)?(?:const|let)\s+(\w+Schema)\s*=\s*z\.object\(",
+    "pydantic": r"class\s+(\w+)\s*\(\s*(?:BaseModel|Schema)\s*\)",
+    "joi": r"(?:export\s+)?(?:const|let)\s+(\w+Schema)\s*=\s*Joi\.object\(",
+}
+
+
+def combine_patterns(patterns: List[str], prefix: str) -> Tuple[re.Pattern, Dict[str, Tuple[int, int]]]:
+    """
+    Join patterns into a single alternation of named groups.
+    
+    Returns the compiled regex and, for each branch name, the slice of
+    match.groups() that holds that branch's own capture groups.
+    """
+    branches = []
+    spans = {}
+    offset = 0
+    
+    for i, pattern in enumerate(patterns):
+        name = f"{prefix}_{i}"
+        inner = re.compile(pattern).groups
+        branches.append(f"(?P<{name}>{pattern})")
+        spans[name] = (offset + 1, offset + 1 + inner)
+        offset += inner + 1
+    
+    return re.compile("|".join(branches), re.IGNORECASE | re.MULTILINE), spans
+
+
+# Patterns are compiled once at import into one alternation per framework,
+# so each file is scanned in a single pass; match.lastgroup tells which
+# branch fired.
+COMPILED_ROUTE_PATTERNS = {
+    framework: combine_patterns(patterns, "route")
+    for framework, patterns in ROUTE_PATTERNS.items()
+}
+
+# One search per middleware type: a single alternation over all types
+# cannot return overlapping matches, so one type's match could hide another's.
+COMPILED_MIDDLEWARE_PATTERNS = {
+    mw_type: re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+    for mw_type, patterns in MIDDLEWARE_PATTERNS.items()
+}
+
+NEWLINE_RE = re.compile(r"\n")
+
+# Dependency-file keywords, in detection priority order. Each group is
+# matched with one alternation so a file is scanned once for all keywords.
+PYTHON_FRAMEWORK_KEYWORDS = {"fastapi": "fastapi", "flask": "flask", "django": "django"}
+GO_FRAMEWORK_KEYWORDS = {"gin-gonic": "gin", "labstack/echo": "echo", "go-chi": "chi"}
+
+PYTHON_FRAMEWORK_RE = re.compile("|".join(map(re.escape, PYTHON_FRAMEWORK_KEYWORDS)))
+GO_FRAMEWORK_RE = re.compile("|".join(map(re.escape, GO_FRAMEWORK_KEYWORDS)))
+
+# Name fragments that mark a route file outside the route directories
+ROUTE_FILE_NAME_KEYWORDS = ("route", "controller", "api")
+
+COMPILED_SCHEMA_PATTERNS = {
+    schema_type: re.compile(pattern)
+    for schema_type, pattern in SCHEMA_PATTERNS.items()
+}
+
+
+@lru_cache(maxsize=1024)
+def _read_cached(path: str, mtime_ns: int) -> str:
+    return Path(path).read_text(encoding="utf-8", errors="ignore")
+
+
+def read_source(file_path: Path) -> str:
+    """Read a file as text, reusing the cached copy while its mtime is unchanged."""
+    return _read_cached(str(file_path), file_path.stat().st_mtime_ns)
+
+
+def walk_files(root: Path, suffixes: Tuple[str, ...]) -> Iterator[os.DirEntry]:
+    """
+    Yield files under root whose name ends with one of suffixes.
+    
+    Uses os.scandir directly so directory type checks come from the cached
+    dirent and no Path is built per entry; IGNORE_DIRS are never entered.
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in IGNORE_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name.endswith(suffixes):
+                        yield entry
+        except OSError:
+            continue
+
 
 def detect_framework(root: Path) -> Optional[str]:
     """Detect the API framework used."""
     pkg_path = root / "package.json"
     if pkg_path.exists():
         try:
-            pkg = json.loads(pkg_path.read_text())
+            pkg = json.loads(read_source(pkg_path))
             deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
             
             if "express" in deps:
@@ -108,13 +264,11 @@ def detect_framework(root: Path) -> Optional[str]:
         py_path = root / pyfile
         if py_path.exists():
             try:
-                content = py_path.read_text().lower()
-                if "fastapi" in content:
-                    return "fastapi"
-                elif "flask" in content:
-                    return "flask"
-                elif "django" in content:
-                    return "django"
+                content = read_source(py_path).lower()
+                hits = set(PYTHON_FRAMEWORK_RE.findall(content))
+                for keyword, framework in PYTHON_FRAMEWORK_KEYWORDS.items():
+                    if keyword in hits:
+                        return framework
             except Exception:
                 pass
     
@@ -122,19 +276,30 @@ def detect_framework(root: Path) -> Optional[str]:
     go_mod = root / "go.mod"
     if go_mod.exists():
         try:
-            content = go_mod.read_text()
-            if "gin-gonic" in content:
-                return "gin"
-            elif "labstack/echo" in content:
-                return "echo"
-            elif "go-chi" in content:
-                return "chi"
+            content = read_source(go_mod)
+            hits = set(GO_FRAMEWORK_RE.findall(content))
+            for keyword, framework in GO_FRAMEWORK_KEYWORDS.items():
+                if keyword in hits:
+                    return framework
         except Exception:
             pass
     
     return None
 
 
+@lru_cache(maxsize=None)
+def route_file_name_re(exts: Tuple[str, ...]) -> re.Pattern:
+    """
+    Compile the basename test for files outside the route directories.
+    
+    Equivalent to the union of the globs "*route*{ext}", "*controller*{ext}"
+    and "*api*{ext}" over all exts, checked with a single fullmatch.
+    """
+    keywords = "|".join(map(re.escape, ROUTE_FILE_NAME_KEYWORDS))
+    suffixes = "|".join(map(re.escape, exts))
+    return re.compile(f".*(?:{keywords}).*(?:{suffixes})")
+
+
 def find_route_files(root: Path, framework: str) -> List[Path]:
     """Find files likely to contain route definitions."""
     route_files = []
@@ -160,80 +325,190 @@ def find_route_files(root: Path, framework: str) -> List[Path]:
         "echo": [".go"],
     }
     
-    exts = extensions.get(framework, [".ts", ".js", ".py", ".go"])
+    exts = tuple(extensions.get(framework, [".ts", ".js", ".py", ".go"]))
+    name_re = route_file_name_re(exts)
     
-    # Search in route directories
-    for route_dir in route_dirs:
-        dir_path = root / route_dir
-        if dir_path.exists():
-            for ext in exts:
-                route_files.extend(dir_path.rglob(f"*{ext}"))
-    
-    # Also search src root for files with route-related names
-    src_path = root / "src"
-    if src_path.exists():
-        for ext in exts:
-            for pattern in ["*route*", "*router*", "*controller*", "*api*"]:
-                route_files.extend(src_path.rglob(f"{pattern}{ext}"))
-    
-    # Filter out ignored dirs
-    route_files = [
-        f for f in route_files
-        if not any(ignore in str(f) for ignore in IGNORE_DIRS)
-    ]
+    # Everything under a route directory counts; under src/ only files with
+    # route-related names do. Both are collected in one walk that never
+    # descends into ignored directories or unrelated parts of the tree.
+    route_prefixes = tuple(d + "/" for d in route_dirs)
+    targets = route_prefixes + ("src/",)
+    
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+        rel_dir = "" if rel_dir == "." else rel_dir + "/"
+        
+        dirnames[:] = [
+            d for d in dirnames
+            if d not in IGNORE_DIRS
+            and any(
+                (rel_dir + d + "/").startswith(t) or t.startswith(rel_dir + d + "/")
+                for t in targets
+            )
+        ]
+        
+        in_route_dir = rel_dir.startswith(route_prefixes)
+        in_src = rel_dir.startswith("src/")
+        if not (in_route_dir or in_src):
+            continue
+        
+        for name in filenames:
+            matched = name.endswith(exts) if in_route_dir else name_re.fullmatch(name)
+            if matched:
+                route_files.append(Path(dirpath) / name)
     
-    return list(set(route_files))
+    return route_files
 
 
-def extract_routes(file_path: Path, framework: str) -> List[Dict]:
-    """Extract route definitions from a file."""
-    routes = []
+def extract_routes(file_path: Path, framework: str, content: Optional[str] = None) -> List[Route]:
+    """Extract route definitions from a file, optionally from already-read content."""
+    routes: List[Route] = []
     
     try:
-        content = file_path.read_text(encoding="utf-8", errors="ignore")
-        lines = content.split("\n")
+        if content is None:
+            content = read_source(file_path)
+        line_starts = [0] + [m.end() for m in NEWLINE_RE.finditer(content)]
         
-        patterns = ROUTE_PATTERNS.get(framework, ROUTE_PATTERNS["express"])
+        pattern, spans = COMPILED_ROUTE_PATTERNS.get(framework, COMPILED_ROUTE_PATTERNS["express"])
+        middleware_by_line = detect_middleware_by_line(content, line_starts)
         
-        for i, line in enumerate(lines, 1):
-            for pattern in patterns:
-                matches = re.findall(pattern, line, re.IGNORECASE)
-                for match in matches:
-                    if isinstance(match, tuple):
-                        if len(match) >= 2:
-                            method = match[0].upper()
-                            path = match[1]
-                        else:
-                            method = "GET"
-                            path = match[0]
-                    else:
-                        method = "GET"
-                        path = match
-                    
-                    # Check for middleware in the same line or nearby
-                    middleware = detect_middleware(line)
-                    
-                    routes.append({
-                        "method": method,
-                        "path": path,
-                        "file": str(file_path),
-                        "line": i,
-                        "middleware": middleware,
-                    })
-    except Exception as e:
+        # Loop invariants hoisted out of the per-match body
+        file_str = sys.intern(str(file_path))
+        bisect_right = bisect.bisect_right
+        append = routes.append
+        
+        for match in pattern.finditer(content):
+            start, end = spans[match.lastgroup]
+            groups = match.groups("")[start:end]
+            if len(groups) >= 2:
+                method = sys.intern(groups[0].upper())
+                path = groups[1]
+            elif groups:
+                method = "GET"
+                path = groups[0]
+            else:
+                method = "GET"
+                path = match.group(match.lastgroup)
+            
+            # Check for middleware in the same line
+            line_num = bisect_right(line_starts, match.start())
+            middleware = middleware_by_line.get(line_num, ())
+            
+            append(Route(method, path, file_str, line_num, middleware))
+    except Exception:
         pass
     
     return routes
 
 
-def extract_nextjs_routes(root: Path) -> List[Dict]:
+def _read_or_none(file_path: Path) -> Optional[str]:
+    try:
+        return read_source(file_path)
+    except Exception:
+        return None
+
+
+def _extract_many(files: List[Path], framework: str) -> List[List[Route]]:
+    """Extract routes per file, fanning out to worker processes for large trees."""
+    if len(files) < PARALLEL_MIN_FILES:
+        # Reads are queued on a thread pool up front so file I/O overlaps
+        # with regex scanning on the main thread
+        with ThreadPoolExecutor(max_workers=READ_AHEAD_WORKERS) as pool:
+            contents = pool.map(_read_or_none, files)
+            return [extract_routes(f, framework, c) for f, c in zip(files, contents)]
+    
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(partial(extract_routes, framework=framework), files, chunksize=16))
+
+
+def extract_all_routes(files: List[Path], framework: str, cache: Optional[Dict] = None) -> List[Route]:
+    """
+    Extract routes from many files.
+    
+    When a cache dict (see load_route_cache) is given, files whose
+    (path, mtime, size) fingerprint is already in it are not re-scanned,
+    and fresh results are added to it.
+    """
+    if cache is None:
+        return [route for file_routes in _extract_many(files, framework) for route in file_routes]
+    
+    per_file: List[Optional[List[Route]]] = []
+    keys = []
+    misses = []
+    for f in files:
+        try:
+            st = f.stat()
+        except OSError:
+            key = None
+        else:
+            key = f"{framework}|{st.st_mtime_ns}|{st.st_size}|{f}"
+        keys.append(key)
+        
+        cached = cache.pop(key, None) if key else None
+        if cached is None:
+            misses.append(len(per_file))
+            per_file.append(None)
+        else:
+            # Re-insert so the dict order tracks recency for eviction
+            cache[key] = cached
+            per_file.append([Route.from_dict(r) for r in cached])
+    
+    fresh = _extract_many([files[i] for i in misses], framework)
+    for i, file_routes in zip(misses, fresh):
+        per_file[i] = file_routes
+        if keys[i]:
+            cache[keys[i]] = [r.to_dict() for r in file_routes]
+    
+    return [route for file_routes in per_file for route in file_routes]
+
+
+def _cache_path(root: Path) -> Path:
+    digest = hashlib.sha1(str(root).encode("utf-8")).hexdigest()[:16]
+    return CACHE_DIR / f"{digest}-v{CACHE_VERSION}.json"
+
+
+def load_route_cache(root: Path) -> Dict:
+    """Load the on-disk route cache for a repo, or an empty one."""
+    try:
+        cache = json.loads(_cache_path(root).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_route_cache(root: Path, cache: Dict) -> None:
+    """Persist the route cache atomically, evicting least recently used entries."""
+    while len(cache) > CACHE_MAX_ENTRIES:
+        del cache[next(iter(cache))]
+    
+    path = _cache_path(root)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        # The cache is an optimization only; never fail the analysis over it
+        pass
+
+
+def extract_nextjs_routes(root: Path) -> List[Route]:
     """Extract routes from Next.js App Router or Pages Router."""
     routes = []
     
     # App Router: app/api/**
     app_api = root / "app" / "api"
     if app_api.exists():
-        for route_file in app_api.rglob("route.ts"):
+        for entry in walk_files(app_api, ("route.ts",)):
+            if entry.name != "route.ts":
+                continue
+            route_file = Path(entry.path)
+            
             # Convert file path to route path
             relative = route_file.parent.relative_to(app_api)
             path = "/" + str(relative).replace("\\", "/")
@@ -241,85 +516,79 @@ def extract_nextjs_routes(root: Path) -> List[Dict]:
             
             # Read file to find methods
             try:
-                content = route_file.read_text()
+                content = read_source(route_file)
                 methods = re.findall(r"export\s+(?:async\s+)?function\s+(GET|POST|PUT|PATCH|DELETE)", content)
                 for method in methods:
-                    routes.append({
-                        "method": method,
-                        "path": f"/api{path}",
-                        "file": str(route_file),
-                        "line": 1,
-                        "middleware": [],
-                    })
+                    routes.append(Route(method, f"/api{path}", str(route_file), 1, ()))
             except Exception:
                 pass
     
     # Pages Router: pages/api/**
     pages_api = root / "pages" / "api"
     if pages_api.exists():
-        for api_file in pages_api.rglob("*.ts"):
-            if api_file.name.startswith("_"):
+        for entry in walk_files(pages_api, (".ts",)):
+            if entry.name.startswith("_"):
                 continue
+            api_file = Path(entry.path)
             
             relative = api_file.relative_to(pages_api)
             path = "/" + str(relative).replace("\\", "/")
             path = path.replace(".ts", "").replace(".js", "")
             path = re.sub(r'\[([^\]]+)\]', r'{\1}', path)
             
-            routes.append({
-                "method": "GET,POST,PUT,DELETE",
-                "path": f"/api{path}",
-                "file": str(api_file),
-                "line": 1,
-                "middleware": [],
-            })
+            routes.append(Route("GET,POST,PUT,DELETE", f"/api{path}", str(api_file), 1, ()))
     
     return routes
 
 
-def detect_middleware(line: str) -> List[str]:
-    """Detect middleware in a route definition."""
-    middleware = []
-    
-    for mw_type, patterns in MIDDLEWARE_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                middleware.append(mw_type)
-                break
-    
-    return middleware
+def detect_middleware_by_line(content: str, line_starts: List[int]) -> Dict[int, Tuple[str, ...]]:
+    """
+    Detect middleware for every line of a file in one scan.
+    
+    Middleware patterns never span a newline, so a type's matches in the
+    whole buffer land on exactly the lines where it would match on its own.
+    """
+    found: Dict[int, List[str]] = {}
+    
+    # Types are scanned in MIDDLEWARE_PATTERNS order, so each line's list
+    # comes out in that order too
+    for mw_type, pattern in COMPILED_MIDDLEWARE_PATTERNS.items():
+        for match in pattern.finditer(content):
+            line_num = bisect.bisect_right(line_starts, match.start())
+            types = found.setdefault(line_num, [])
+            if not types or types[-1] != mw_type:
+                types.append(mw_type)
+    
+    return {line_num: tuple(types) for line_num, types in found.items()}
 
 
 def find_schemas(root: Path, framework: str) -> List[Dict]:
     """Find validation schemas in the codebase."""
     schemas = []
     
-    schema_patterns = {
-        "zod": r"(?:export\s+)?(?:const|let)\s+(\w+Schema)\s*=\s*z\.object\(",
-        "pydantic": r"class\s+(\w+)\s*\(\s*(?:BaseModel|Schema)\s*\)",
-        "joi": r"(?:export\s+)?(?:const|let)\s+(\w+Schema)\s*=\s*Joi\.object\(",
-    }
-    
     search_dirs = ["src/schemas", "schemas", "src/validators", "src/models"]
     
     for search_dir in search_dirs:
         dir_path = root / search_dir
         if dir_path.exists():
-            for f in dir_path.rglob("*"):
-                if f.suffix in [".ts", ".js", ".py"]:
-                    try:
-                        content = f.read_text(encoding="utf-8", errors="ignore")
-                        
-                        for schema_type, pattern in schema_patterns.items():
-                            matches = re.findall(pattern, content)
-                            for match in matches:
-                                schemas.append({
-                                    "name": match,
-                                    "type": schema_type,
-                                    "file": str(f.relative_to(root)),
-                                })
-                    except Exception:
-                        pass
+            for entry in walk_files(dir_path, (".ts", ".js", ".py")):
+                try:
+                    # Check size before reading so large generated files are never decoded
+                    if entry.stat().st_size > MAX_SCHEMA_FILE_SIZE:
+                        continue
+                    content = read_source(Path(entry.path))
+                    rel_path = os.path.relpath(entry.path, root)
+                    
+                    for schema_type, pattern in COMPILED_SCHEMA_PATTERNS.items():
+                        matches = pattern.findall(content)
+                        for match in matches:
+                            schemas.append({
+                                "name": match,
+                                "type": schema_type,
+                                "file": rel_path,
+                            })
+                except Exception:
+                    pass
     
     return schemas
 
@@ -341,13 +610,11 @@ def format_output(result: Dict) -> str:
     if routes:
         lines.append(f"\n📋 Routes:")
         
-        # Sort by path
-        sorted_routes = sorted(routes, key=lambda r: r["path"])
-        
-        for route in sorted_routes[:30]:
-            method = route["method"]
-            path = route["path"]
-            mw = ", ".join(route.get("middleware", [])) or "-"
+        # Only the first 30 by path are shown, so avoid sorting the rest
+        for route in heapq.nsmallest(30, routes, key=operator.attrgetter("path")):
+            method = route.method
+            path = route.path
+            mw = ", ".join(route.middleware) or "-"
             lines.append(f"   {method:7} {path:40} [{mw}]")
         
         if len(routes) > 30:
@@ -385,11 +652,13 @@ def main():
     
     if framework == "nextjs":
         routes = extract_nextjs_routes(root)
-        files = [r["file"] for r in routes]
+        files = [r.file for r in routes]
     elif framework:
         files = find_route_files(root, framework)
-        for f in files:
-            routes.extend(extract_routes(f, framework))
+        cache = None if "--no-cache" in sys.argv else load_route_cache(root)
+        routes = extract_all_routes(files, framework, cache)
+        if cache is not None:
+            save_route_cache(root, cache)
     
     # Find schemas
     schemas = find_schemas(root, framework or "express")
@@ -402,7 +671,9 @@ def main():
     }
     
     if "--json" in sys.argv:
-        print(json.dumps(result, indent=2))
+        # Stream to stdout rather than building the whole document in memory
+        json.dump({**result, "routes": [r.to_dict() for r in routes]}, sys.stdout, indent=2)
+        sys.stdout.write("\n")
     else:
         print(format_output(result))
 
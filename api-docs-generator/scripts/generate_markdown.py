@@ -13,48 +13,116 @@ import os
 import sys
 import json
 import re
+import io
 from pathlib import Path
 from typing import Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj) -> str:
+    """Pretty-print JSON, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+        except TypeError:
+            # orjson rejects non-str keys (e.g. YAML integer status codes)
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+def _loads(content: str):
+    """Parse JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
 
 def load_spec(file_path: Path) -> Dict:
-    """Load OpenAPI spec from YAML or JSON."""
+    """
+    Load OpenAPI spec from YAML or JSON.
+    
+    YAML is parsed with PyYAML's libyaml-backed CSafeLoader when available,
+    which is 10-20x faster than the pure-Python SafeLoader on large specs.
+    Install PyYAML with libyaml support to get it.
+    
+    A .yaml file whose first non-whitespace character is '{' or '[' is
+    tried as JSON first, since JSON is valid YAML and parses much faster.
+    """
     content = file_path.read_text()
     
     if file_path.suffix in [".yaml", ".yml"]:
-        # Simple YAML parser for common cases
-        import yaml
+        if content.lstrip()[:1] in ("{", "["):
+            try:
+                return _loads(content)
+            except ValueError:
+                pass  # YAML flow style, not JSON
         try:
-            return yaml.safe_load(content)
+            import yaml
         except ImportError:
             # Fallback to JSON if yaml not available
             print("Warning: PyYAML not installed, trying JSON format")
-            return json.loads(content)
+            return _loads(content)
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        return yaml.load(content, Loader=loader)
     else:
-        return json.loads(content)
+        return _loads(content)
 
 
-def resolve_ref(spec: Dict, ref: str) -> Dict:
-    """Resolve a $ref to its actual schema."""
+def resolve_ref(spec: Dict, ref: str, cache: Optional[Dict] = None) -> Dict:
+    """
+    Resolve a $ref to its actual schema.
+    
+    A cache dict, valid for one unchanged spec, remembers each ref's target.
+    """
     if not ref.startswith("#/"):
         return {"type": "object"}
     
+    if cache is not None and ref in cache:
+        return cache[ref]
+    
     parts = ref[2:].split("/")
     result = spec
     for part in parts:
         result = result.get(part, {})
     
+    if cache is not None:
+        cache[ref] = result
     return result
 
 
-def schema_to_example(spec: Dict, schema: Dict, depth: int = 0) -> any:
-    """Generate example value from schema."""
+def schema_to_example(spec: Dict, schema: Dict, depth: int = 0, cache: Optional[Dict] = None,
+                      ref_cache: Optional[Dict] = None) -> any:
+    """
+    Generate example value from schema.
+    
+    When a cache dict is passed, examples built for a $ref are stored under
+    (ref, depth) and returned as-is on reuse. Callers only serialize the
+    result, so sharing it between operations is safe. ref_cache is passed
+    on to resolve_ref.
+    """
     if depth > 5:
         return "..."
     
     if "$ref" in schema:
-        schema = resolve_ref(spec, schema["$ref"])
+        ref = schema["$ref"]
+        # One hop only: a $ref inside the target is not followed
+        schema = resolve_ref(spec, ref, ref_cache)
+        if cache is not None:
+            key = (ref, depth)
+            if key not in cache:
+                cache[key] = _resolved_example(spec, schema, depth, cache, ref_cache)
+            return cache[key]
     
+    return _resolved_example(spec, schema, depth, cache, ref_cache)
+
+
+def _resolved_example(spec: Dict, schema: Dict, depth: int, cache: Optional[Dict],
+                      ref_cache: Optional[Dict]) -> any:
+    """Generate example value from a schema whose $ref was already resolved."""
     if "example" in schema:
         return schema["example"]
     
@@ -82,11 +150,11 @@ def schema_to_example(spec: Dict, schema: Dict, depth: int = 0) -> any:
         return True
     elif schema_type == "array":
         items = schema.get("items", {})
-        return [schema_to_example(spec, items, depth + 1)]
+        return [schema_to_example(spec, items, depth + 1, cache, ref_cache)]
     elif schema_type == "object":
         result = {}
         for prop, prop_schema in schema.get("properties", {}).items():
-            result[prop] = schema_to_example(spec, prop_schema, depth + 1)
+            result[prop] = schema_to_example(spec, prop_schema, depth + 1, cache, ref_cache)
         return result
     
     return None
@@ -94,49 +162,47 @@ def schema_to_example(spec: Dict, schema: Dict, depth: int = 0) -> any:
 
 def generate_markdown(spec: Dict) -> str:
     """Generate markdown documentation from OpenAPI spec."""
-    lines = []
+    buf = io.StringIO()
+    w = buf.write
+    # Both caches describe this spec only and are dropped when this returns
+    example_cache = {}
+    ref_cache = {}
     
     info = spec.get("info", {})
     
     # Header
-    lines.append(f"# {info.get('title', 'API Documentation')}")
-    lines.append("")
+    w(f"# {info.get('title', 'API Documentation')}\n\n")
     
     if info.get("description"):
-        lines.append(info["description"])
-        lines.append("")
+        w(info["description"] + "\n\n")
     
-    lines.append(f"**Version:** {info.get('version', '1.0.0')}")
-    lines.append("")
+    w(f"**Version:** {info.get('version', '1.0.0')}\n\n")
     
     # Servers
     servers = spec.get("servers", [])
     if servers:
-        lines.append("## Servers")
-        lines.append("")
+        w("## Servers\n\n")
         for server in servers:
             desc = server.get("description", "")
-            lines.append(f"- `{server['url']}` - {desc}")
-        lines.append("")
+            w(f"- `{server['url']}` - {desc}\n")
+        w("\n")
     
     # Authentication
     security_schemes = spec.get("components", {}).get("securitySchemes", {})
     if security_schemes:
-        lines.append("## Authentication")
-        lines.append("")
+        w("## Authentication\n\n")
         for name, scheme in security_schemes.items():
             scheme_type = scheme.get("type", "")
             if scheme_type == "http" and scheme.get("scheme") == "bearer":
-                lines.append("Bearer token authentication required.")
-                lines.append("")
-                lines.append("```")
-                lines.append("Authorization: Bearer <token>")
-                lines.append("```")
+                w("Bearer token authentication required.\n\n"
+                  "```\n"
+                  "Authorization: Bearer <token>\n"
+                  "```\n")
             elif scheme_type == "apiKey":
                 location = scheme.get("in", "header")
                 key_name = scheme.get("name", "X-API-Key")
-                lines.append(f"API Key required in {location}: `{key_name}`")
-        lines.append("")
+                w(f"API Key required in {location}: `{key_name}`\n")
+        w("\n")
     
     # Group endpoints by tag
     paths = spec.get("paths", {})
@@ -160,16 +226,14 @@ def generate_markdown(spec: Dict) -> str:
                 })
     
     # Generate docs for each tag
-    lines.append("## Endpoints")
-    lines.append("")
+    w("## Endpoints\n\n")
     
     for tag_info in tags or [{"name": t} for t in tag_operations.keys()]:
         tag_name = tag_info.get("name", "Default") if isinstance(tag_info, dict) else tag_info
         if tag_name not in tag_operations:
             continue
         
-        lines.append(f"### {tag_name}")
-        lines.append("")
+        w(f"### {tag_name}\n\n")
         
         for op_info in tag_operations[tag_name]:
             path = op_info["path"]
@@ -178,21 +242,17 @@ def generate_markdown(spec: Dict) -> str:
             
             # Operation header
             summary = operation.get("summary", f"{method} {path}")
-            lines.append(f"#### {summary}")
-            lines.append("")
-            lines.append(f"```")
-            lines.append(f"{method} {path}")
-            lines.append(f"```")
-            lines.append("")
+            w(f"#### {summary}\n\n"
+              f"```\n"
+              f"{method} {path}\n"
+              f"```\n\n")
             
             if operation.get("description"):
-                lines.append(operation["description"])
-                lines.append("")
+                w(operation["description"] + "\n\n")
             
             # Auth required?
             if operation.get("security"):
-                lines.append("🔒 **Authentication required**")
-                lines.append("")
+                w("🔒 **Authentication required**\n\n")
             
             # Parameters
             params = operation.get("parameters", [])
@@ -204,66 +264,59 @@ def generate_markdown(spec: Dict) -> str:
             )]
             
             if path_params:
-                lines.append("**Path Parameters:**")
-                lines.append("")
-                lines.append("| Name | Type | Description |")
-                lines.append("|------|------|-------------|")
+                w("**Path Parameters:**\n\n"
+                  "| Name | Type | Description |\n"
+                  "|------|------|-------------|\n")
                 for param in path_params:
                     if "$ref" in param:
-                        param = resolve_ref(spec, param["$ref"])
+                        param = resolve_ref(spec, param["$ref"], ref_cache)
                     name = param.get("name", "")
                     schema = param.get("schema", {})
                     param_type = schema.get("type", "string")
                     desc = param.get("description", "")
-                    lines.append(f"| {name} | {param_type} | {desc} |")
-                lines.append("")
+                    w(f"| {name} | {param_type} | {desc} |\n")
+                w("\n")
             
             if query_params:
-                lines.append("**Query Parameters:**")
-                lines.append("")
-                lines.append("| Name | Type | Required | Default | Description |")
-                lines.append("|------|------|----------|---------|-------------|")
+                w("**Query Parameters:**\n\n"
+                  "| Name | Type | Required | Default | Description |\n"
+                  "|------|------|----------|---------|-------------|\n")
                 for param in query_params:
                     if "$ref" in param:
-                        param = resolve_ref(spec, param["$ref"])
+                        param = resolve_ref(spec, param["$ref"], ref_cache)
                     name = param.get("name", "")
                     schema = param.get("schema", {})
                     param_type = schema.get("type", "string")
                     required = "Yes" if param.get("required") else "No"
                     default = schema.get("default", "-")
                     desc = param.get("description", "")
-                    lines.append(f"| {name} | {param_type} | {required} | {default} | {desc} |")
-                lines.append("")
+                    w(f"| {name} | {param_type} | {required} | {default} | {desc} |\n")
+                w("\n")
             
             # Request body
             request_body = operation.get("requestBody", {})
             if request_body:
-                lines.append("**Request Body:**")
-                lines.append("")
+                w("**Request Body:**\n\n")
                 content = request_body.get("content", {})
                 json_content = content.get("application/json", {})
                 schema = json_content.get("schema", {})
                 
                 # Generate example
-                example = json_content.get("example") or schema_to_example(spec, schema)
+                example = json_content.get("example") or schema_to_example(spec, schema, cache=example_cache, ref_cache=ref_cache)
                 if example:
-                    lines.append("```json")
-                    lines.append(json.dumps(example, indent=2))
-                    lines.append("```")
-                    lines.append("")
+                    w(f"```json\n{_dumps(example)}\n```\n\n")
             
             # Responses
             responses = operation.get("responses", {})
             if responses:
-                lines.append("**Responses:**")
-                lines.append("")
+                w("**Responses:**\n\n")
                 
                 for status, response in responses.items():
                     if "$ref" in response:
-                        response = resolve_ref(spec, response["$ref"])
+                        response = resolve_ref(spec, response["$ref"], ref_cache)
                     
                     desc = response.get("description", "")
-                    lines.append(f"- `{status}` - {desc}")
+                    w(f"- `{status}` - {desc}\n")
                     
                     # Show example for success responses
                     if status.startswith("2"):
@@ -272,37 +325,28 @@ def generate_markdown(spec: Dict) -> str:
                         schema = json_content.get("schema", {})
                         
                         if schema:
-                            example = json_content.get("example") or schema_to_example(spec, schema)
+                            example = json_content.get("example") or schema_to_example(spec, schema, cache=example_cache, ref_cache=ref_cache)
                             if example:
-                                lines.append("")
-                                lines.append("```json")
-                                lines.append(json.dumps(example, indent=2))
-                                lines.append("```")
+                                w(f"\n```json\n{_dumps(example)}\n```\n")
                 
-                lines.append("")
+                w("\n")
             
-            lines.append("---")
-            lines.append("")
+            w("---\n\n")
     
     # Schemas
     schemas = spec.get("components", {}).get("schemas", {})
     if schemas:
-        lines.append("## Schemas")
-        lines.append("")
+        w("## Schemas\n\n")
         
         for name, schema in schemas.items():
             if name == "Error":
                 continue  # Skip error schema
             
-            lines.append(f"### {name}")
-            lines.append("")
-            lines.append("```json")
-            example = schema_to_example(spec, schema)
-            lines.append(json.dumps(example, indent=2))
-            lines.append("```")
-            lines.append("")
+            example = schema_to_example(spec, schema, cache=example_cache, ref_cache=ref_cache)
+            w(f"### {name}\n\n```json\n{_dumps(example)}\n```\n\n")
     
-    return "\n".join(lines)
+    # Drop the final newline so the result matches a "\n".join() of lines
+    return buf.getvalue()[:-1]
 
 
 def main():
@@ -3,10 +3,11 @@
 Generate OpenAPI 3.0 specification from analyzed routes.
 
 Usage:
-    python generate_openapi.py <routes.json> --output openapi.yaml
+    python generate_openapi.py <routes.json> [--output openapi.json] [--yaml]
 
 Output:
-    - OpenAPI 3.0 specification in YAML or JSON format
+    - OpenAPI 3.0 specification in JSON format (default), or YAML with
+      --yaml or an --output path ending in .yaml/.yml
 """
 
 import os
@@ -14,71 +15,121 @@ import sys
 import json
 import re
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from collections import defaultdict
+from functools import lru_cache
 
-# Default OpenAPI template
-OPENAPI_TEMPLATE = {
-    "openapi": "3.0.3",
-    "info": {
-        "title": "API Documentation",
-        "version": "1.0.0",
-        "description": "Auto-generated API documentation",
-    },
-    "servers": [
-        {"url": "http://localhost:3000", "description": "Development"},
-    ],
-    "paths": {},
-    "components": {
-        "schemas": {},
-        "parameters": {
-            "PageParam": {
-                "name": "page",
-                "in": "query",
-                "schema": {"type": "integer", "default": 1, "minimum": 1},
+from analyze_routes import Route
+
+try:
+    import yaml
+    # libyaml's C emitter when PyYAML was built with it
+    _Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+except ImportError:
+    yaml = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+OUTPUT_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+SUPPORTED_METHODS = {"get", "post", "put", "patch", "delete"}
+
+# Express :param and OpenAPI {param} path segments
+EXPRESS_PARAM_RE = re.compile(r':(\w+)')
+OPENAPI_PARAM_RE = re.compile(r'\{(\w+)\}')
+
+
+def _make_spec_template() -> Dict:
+    """Return a fresh default OpenAPI document; nothing is shared between calls."""
+    return {
+        "openapi": "3.0.3",
+        "info": {
+            "title": "API Documentation",
+            "version": "1.0.0",
+            "description": "Auto-generated API documentation",
+        },
+        "servers": [
+            {"url": "http://localhost:3000", "description": "Development"},
+        ],
+        "paths": {},
+        "components": {
+            "schemas": {
+                "Error": {
+                    "type": "object",
+                    "properties": {
+                        "status": {"type": "integer"},
+                        "code": {"type": "string"},
+                        "message": {"type": "string"},
+                    },
+                    "required": ["status", "code", "message"],
+                }
             },
-            "LimitParam": {
-                "name": "limit",
-                "in": "query",
-                "schema": {"type": "integer", "default": 20, "minimum": 1, "maximum": 100},
+            "parameters": {
+                "PageParam": {
+                    "name": "page",
+                    "in": "query",
+                    "schema": {"type": "integer", "default": 1, "minimum": 1},
+                },
+                "LimitParam": {
+                    "name": "limit",
+                    "in": "query",
+                    "schema": {"type": "integer", "default": 20, "minimum": 1, "maximum": 100},
+                },
             },
-        },
-        "responses": {
-            "BadRequest": {
-                "description": "Invalid request data",
-                "content": {
-                    "application/json": {
-                        "schema": {"$ref": "#/components/schemas/Error"}
-                    }
+            "responses": {
+                "Success": {
+                    "description": "Successful response",
+                    "content": {
+                        "application/json": {
+                            "schema": {"type": "object"}
+                        }
+                    },
                 },
+                "BadRequest": {
+                    "description": "Invalid request data",
+                    "content": {
+                        "application/json": {
+                            "schema": {"$ref": "#/components/schemas/Error"}
+                        }
+                    },
+                },
+                "Unauthorized": {"description": "Authentication required"},
+                "Forbidden": {"description": "Insufficient permissions"},
+                "NotFound": {"description": "Resource not found"},
+            },
+            "securitySchemes": {
+                "BearerAuth": {
+                    "type": "http",
+                    "scheme": "bearer",
+                    "bearerFormat": "JWT",
+                }
             },
-            "Unauthorized": {"description": "Authentication required"},
-            "Forbidden": {"description": "Insufficient permissions"},
-            "NotFound": {"description": "Resource not found"},
-        },
-        "securitySchemes": {
-            "BearerAuth": {
-                "type": "http",
-                "scheme": "bearer",
-                "bearerFormat": "JWT",
-            }
         },
-    },
-    "tags": [],
-}
+        "tags": [],
+    }
 
 
+@lru_cache(maxsize=4096)
 def path_to_openapi(path: str) -> str:
     """Convert route path to OpenAPI format."""
     # Express :param -> OpenAPI {param}
-    path = re.sub(r':(\w+)', r'{\1}', path)
-    return path
+    return EXPRESS_PARAM_RE.sub(r'{\1}', path)
 
 
-def extract_path_params(path: str) -> List[Dict]:
-    """Extract path parameters from route path."""
+@lru_cache(maxsize=4096)
+def extract_path_params(path: str) -> Tuple[Dict, ...]:
+    """
+    Extract path parameters from route path.
+    
+    Results are cached per path and shared between callers, so copy
+    the dicts before putting them into a spec.
+    """
     params = []
-    param_matches = re.findall(r'\{(\w+)\}', path)
+    param_matches = OPENAPI_PARAM_RE.findall(path)
     
     for param in param_matches:
         params.append({
@@ -96,9 +147,10 @@ def extract_path_params(path: str) -> List[Dict]:
         if param["schema"].get("format") is None:
             del param["schema"]["format"]
     
-    return params
+    return tuple(params)
 
 
+@lru_cache(maxsize=4096)
 def infer_tag(path: str, file_path: str) -> str:
     """Infer tag from path or file."""
     # Try to get from path
@@ -116,30 +168,43 @@ def infer_tag(path: str, file_path: str) -> str:
     
     # Fall back to file name
     if file_path:
-        file_name = Path(file_path).stem
+        file_name = os.path.splitext(os.path.basename(file_path))[0]
         return file_name.replace(".routes", "").replace(".controller", "").title()
     
     return "Default"
 
 
-def method_to_operation(method: str, path: str, route: Dict) -> Dict:
+@lru_cache(maxsize=1024)
+def _singularize(word: str) -> str:
+    """Naive English singular for a resource tag (Users -> User, Categories -> Category)."""
+    if word.endswith("ies") and len(word) > 3:
+        return word[:-3] + "y"
+    if word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def _response_ref(name: str) -> Dict:
+    """
+    Reference to a shared entry in components.responses.
+    
+    The 200 response is declared once and referenced from every operation
+    instead of being inlined, which keeps large specs small.
+    """
+    return {"$ref": f"#/components/responses/{name}"}
+
+
+def method_to_operation(method: str, path: str, route: Route) -> Dict:
     """Convert route to OpenAPI operation."""
-    resource = infer_tag(path, route.get("file", ""))
-    resource_singular = resource.rstrip("s")
+    resource = infer_tag(path, route.file)
+    resource_singular = _singularize(resource)
     
     operation = {
         "summary": "",
         "operationId": "",
         "tags": [resource],
         "responses": {
-            "200": {
-                "description": "Successful response",
-                "content": {
-                    "application/json": {
-                        "schema": {"type": "object"}
-                    }
-                }
-            }
+            "200": _response_ref("Success"),
         }
     }
     
@@ -177,7 +242,7 @@ def method_to_operation(method: str, path: str, route: Dict) -> Dict:
                 }
             }
         }
-        operation["responses"]["400"] = {"$ref": "#/components/responses/BadRequest"}
+        operation["responses"]["400"] = _response_ref("BadRequest")
     elif method == "PUT" or method == "PATCH":
         operation["summary"] = f"Update {resource_singular}"
         operation["operationId"] = f"update{resource_singular}"
@@ -195,14 +260,16 @@ def method_to_operation(method: str, path: str, route: Dict) -> Dict:
         operation["responses"]["204"] = {"description": "Deleted"}
     
     # Add auth if detected
-    if "auth" in route.get("middleware", []):
+    if "auth" in route.middleware:
         operation["security"] = [{"BearerAuth": []}]
     
     # Add path parameters
     if path_params:
         if "parameters" not in operation:
             operation["parameters"] = []
-        operation["parameters"].extend(path_params)
+        operation["parameters"].extend(
+            {**p, "schema": dict(p["schema"])} for p in path_params
+        )
     
     return operation
 
@@ -220,22 +287,9 @@ def generate_schema_stub(name: str) -> Dict:
     }
 
 
-def generate_openapi(routes: List[Dict], config: Dict = None) -> Dict:
-    """Generate OpenAPI specification from routes."""
-    spec = OPENAPI_TEMPLATE.copy()
-    spec["paths"] = {}
-    spec["components"] = dict(spec["components"])
-    spec["components"]["schemas"] = {
-        "Error": {
-            "type": "object",
-            "properties": {
-                "status": {"type": "integer"},
-                "code": {"type": "string"},
-                "message": {"type": "string"},
-            },
-            "required": ["status", "code", "message"],
-        }
-    }
+def generate_openapi(routes: List[Route], config: Dict = None) -> Dict:
+    """Generate OpenAPI specification from routes (Route records or route dicts)."""
+    spec = _make_spec_template()
     
     # Apply config
     if config:
@@ -245,35 +299,41 @@ def generate_openapi(routes: List[Dict], config: Dict = None) -> Dict:
             spec["servers"] = config["servers"]
     
     tags_set = set()
+    schemas = spec["components"]["schemas"]
+    stubbed = set()
     
     # Group routes by path
-    path_routes = {}
+    path_routes = defaultdict(dict)
     for route in routes:
-        path = path_to_openapi(route["path"])
-        if path not in path_routes:
-            path_routes[path] = {}
+        if not isinstance(route, Route):
+            route = Route.from_dict(route)
+        # Looked up even when no method below matches, so the path is kept
+        methods = path_routes[path_to_openapi(route.path)]
         
-        methods = route["method"].split(",")
-        for method in methods:
+        for method in route.method.split(","):
             method = method.strip().lower()
-            if method in ["get", "post", "put", "patch", "delete"]:
-                path_routes[path][method] = route
+            if method in SUPPORTED_METHODS:
+                methods[method] = route
     
     # Generate operations
     for path, methods in path_routes.items():
-        spec["paths"][path] = {}
+        spec["paths"][path] = operations = {
+            method: method_to_operation(method.upper(), path, route)
+            for method, route in methods.items()
+        }
         
-        for method, route in methods.items():
-            operation = method_to_operation(method.upper(), path, route)
-            spec["paths"][path][method] = operation
-            
+        for operation in operations.values():
             # Collect tags
-            for tag in operation.get("tags", []):
-                tags_set.add(tag)
+            tags = operation.get("tags")
+            if tags:
+                tags_set.update(tags)
             
-            # Generate schema stubs
-            resource = operation["tags"][0] if operation.get("tags") else "Resource"
-            resource_singular = resource.rstrip("s")
+            # Generate schema stubs, once per resource
+            resource = tags[0] if tags else "Resource"
+            if resource in stubbed:
+                continue
+            stubbed.add(resource)
+            resource_singular = _singularize(resource)
             
             schema_names = [
                 resource_singular,
@@ -282,8 +342,8 @@ def generate_openapi(routes: List[Dict], config: Dict = None) -> Dict:
             ]
             
             for schema_name in schema_names:
-                if schema_name not in spec["components"]["schemas"]:
-                    spec["components"]["schemas"][schema_name] = generate_schema_stub(schema_name)
+                if schema_name not in schemas:
+                    schemas[schema_name] = generate_schema_stub(schema_name)
     
     # Generate tags
     spec["tags"] = [{"name": tag} for tag in sorted(tags_set)]
@@ -291,77 +351,45 @@ def generate_openapi(routes: List[Dict], config: Dict = None) -> Dict:
     return spec
 
 
-def to_yaml(obj: Dict, indent: int = 0) -> str:
-    """Convert dict to YAML string (simple implementation)."""
-    lines = []
-    prefix = "  " * indent
-    
-    for key, value in obj.items():
-        if value is None:
-            continue
-        elif isinstance(value, dict):
-            lines.append(f"{prefix}{key}:")
-            lines.append(to_yaml(value, indent + 1))
-        elif isinstance(value, list):
-            lines.append(f"{prefix}{key}:")
-            for item in value:
-                if isinstance(item, dict):
-                    lines.append(f"{prefix}  -")
-                    # Inline first key
-                    first = True
-                    for k, v in item.items():
-                        if first:
-                            if isinstance(v, (dict, list)):
-                                lines.append(f"{prefix}    {k}:")
-                                lines.append(to_yaml(v, indent + 3))
-                            else:
-                                lines.append(f"{prefix}    {k}: {format_yaml_value(v)}")
-                            first = False
-                        else:
-                            if isinstance(v, (dict, list)):
-                                lines.append(f"{prefix}    {k}:")
-                                lines.append(to_yaml(v, indent + 3))
-                            else:
-                                lines.append(f"{prefix}    {k}: {format_yaml_value(v)}")
-                else:
-                    lines.append(f"{prefix}  - {format_yaml_value(item)}")
-        else:
-            lines.append(f"{prefix}{key}: {format_yaml_value(value)}")
-    
-    return "\n".join(lines)
-
-
-def format_yaml_value(value) -> str:
-    """Format a value for YAML output."""
-    if isinstance(value, bool):
-        return "true" if value else "false"
-    elif isinstance(value, str):
-        if any(c in value for c in [":", "#", "'", '"', "\n", "{", "}"]):
-            return f'"{value}"'
-        return value
-    elif value is None:
-        return "null"
+def dump_json(spec: Dict, stream) -> None:
+    """Write the spec to a text stream as compact JSON, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            stream.write(orjson.dumps(spec).decode())
+            return
+        except TypeError:
+            # orjson rejects non-str keys (e.g. integer codes from a YAML config)
+            pass
+    json.dump(spec, stream, separators=(",", ":"))
+
+
+def dump_spec(spec: Dict, stream, as_yaml: bool = False) -> None:
+    """Write the spec to a text stream without building the whole document first."""
+    if as_yaml:
+        yaml.dump(spec, stream, Dumper=_Dumper, sort_keys=False,
+                  default_flow_style=False, allow_unicode=True)
     else:
-        return str(value)
+        dump_json(spec, stream)
 
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python generate_openapi.py <routes.json> [--output file.yaml]")
-        print("       python generate_openapi.py <path> [--output file.yaml]")
+        print("Usage: python generate_openapi.py <routes.json> [--output file] [--yaml]")
+        print("       python generate_openapi.py <path> [--output file] [--yaml]")
         sys.exit(1)
     
     input_path = Path(sys.argv[1])
     
     # Check if input is a routes JSON or a directory to analyze
     if input_path.suffix == ".json":
-        routes = json.loads(input_path.read_text())
-        if isinstance(routes, dict) and "routes" in routes:
-            routes = routes["routes"]
+        data = json.loads(input_path.read_text())
+        if isinstance(data, dict) and "routes" in data:
+            data = data["routes"]
+        routes = [Route.from_dict(r) for r in data]
     else:
         # Run route analysis
         print("Analyzing routes...")
-        from analyze_routes import detect_framework, find_route_files, extract_routes, extract_nextjs_routes
+        from analyze_routes import detect_framework, find_route_files, extract_all_routes, extract_nextjs_routes
         
         root = input_path.resolve()
         framework = detect_framework(root)
@@ -370,9 +398,7 @@ def main():
             routes = extract_nextjs_routes(root)
         elif framework:
             files = find_route_files(root, framework)
-            routes = []
-            for f in files:
-                routes.extend(extract_routes(f, framework))
+            routes = extract_all_routes(files, framework)
         else:
             routes = []
     
@@ -390,16 +416,24 @@ def main():
         if idx + 1 < len(sys.argv):
             output_path = sys.argv[idx + 1]
     
-    if "--json" in sys.argv:
-        output = json.dumps(spec, indent=2)
-    else:
-        output = to_yaml(spec)
+    want_yaml = "--yaml" in sys.argv or (
+        output_path is not None and Path(output_path).suffix in (".yaml", ".yml")
+    )
+    
+    if want_yaml and yaml is None:
+        # JSON is valid YAML, so this still yields a usable spec
+        print("Warning: PyYAML not installed, writing JSON", file=sys.stderr)
+        want_yaml = False
     
     if output_path:
-        Path(output_path).write_text(output)
+        # Large write buffer so big specs go out in few syscalls
+        with open(output_path, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as f:
+            dump_spec(spec, f, want_yaml)
         print(f"✅ OpenAPI spec written to: {output_path}")
     else:
-        print(output)
+        dump_spec(spec, sys.stdout, want_yaml)
+        if not want_yaml:
+            sys.stdout.write("\n")
 
 
 if __name__ == "__main__":
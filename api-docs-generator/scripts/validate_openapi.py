@@ -19,92 +19,246 @@ import re
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+PATH_PARAM_RE = re.compile(r'\{(\w+)\}')
+
 
 def load_spec(file_path: Path) -> Dict:
-    """Load OpenAPI spec from YAML or JSON."""
+    """Load OpenAPI spec from YAML or JSON (YAML via libyaml when available)."""
     content = file_path.read_text()
     
     if file_path.suffix in [".yaml", ".yml"]:
+        # JSON is valid YAML and far cheaper to parse
+        if content.lstrip()[:1] in ("{", "["):
+            try:
+                return json.loads(content)
+            except ValueError:
+                pass
         try:
             import yaml
-            return yaml.safe_load(content)
         except ImportError:
             print("Warning: PyYAML not installed")
             return json.loads(content)
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        return yaml.load(content, Loader=loader)
     else:
         return json.loads(content)
 
 
-def validate_refs(spec: Dict) -> List[str]:
-    """Validate all $ref references resolve."""
-    errors = []
-    
-    def check_ref(obj: any, path: str):
-        if isinstance(obj, dict):
-            if "$ref" in obj:
-                ref = obj["$ref"]
-                if ref.startswith("#/"):
-                    # Validate internal ref
-                    parts = ref[2:].split("/")
-                    target = spec
-                    for part in parts:
-                        if isinstance(target, dict) and part in target:
-                            target = target[part]
-                        else:
-                            errors.append(f"{path}: Reference not found: {ref}")
-                            break
-            
-            for key, value in obj.items():
-                check_ref(value, f"{path}.{key}")
-        elif isinstance(obj, list):
-            for i, item in enumerate(obj):
-                check_ref(item, f"{path}[{i}]")
-    
-    check_ref(spec, "root")
-    return errors
+def _resolve_ref(spec: Dict, ref: str) -> bool:
+    """Return True if an internal "#/..." ref points at something in spec."""
+    target = spec
+    for part in ref[2:].split("/"):
+        if isinstance(target, dict) and part in target:
+            target = target[part]
+        else:
+            return False
+    return True
+
+
+HTTP_METHODS = {"get", "post", "put", "patch", "delete", "options", "head", "trace"}
+SCHEMA_TYPES = {"string", "number", "integer", "boolean", "array", "object", "null"}
 
+# Node kinds the walker dispatches on, keyed by (parent kind, key)
+CHILD_KINDS = {
+    ("root", "paths"): "paths",
+    ("root", "components"): "components",
+    ("components", "schemas"): "schemas",
+}
 
-def validate_structure(spec: Dict) -> List[str]:
-    """Validate OpenAPI structure."""
-    errors = []
+
+def _format_trail(trail) -> str:
+    """Render a (parent, key, is_index) chain as root.paths./users.get..."""
+    parts = []
+    while trail is not None:
+        trail, key, is_index = trail
+        parts.append(f"[{key}]" if is_index else f".{key}")
+    parts.append("root")
+    return "".join(reversed(parts))
+
+
+class Validator:
+    """
+    Run every check in a single descent of the spec.
     
-    # Required top-level fields
-    if "openapi" not in spec:
-        errors.append("Missing required field: openapi")
-    elif not spec["openapi"].startswith("3."):
-        errors.append(f"Invalid OpenAPI version: {spec['openapi']} (expected 3.x)")
+    The walk checks $refs on every node and hands the root, each path
+    item and components.schemas to visitors for the structural checks,
+    so the spec is traversed once instead of once per category.
     
-    if "info" not in spec:
-        errors.append("Missing required field: info")
-    else:
-        if "title" not in spec["info"]:
-            errors.append("Missing required field: info.title")
-        if "version" not in spec["info"]:
-            errors.append("Missing required field: info.version")
+    Pass shared_nodes=False when the spec cannot contain the same dict in
+    more than one place (e.g. it was parsed from JSON) to skip tracking
+    already-visited subtrees.
+    """
     
-    if "paths" not in spec:
-        errors.append("Missing required field: paths")
+    def __init__(self, spec: Dict, shared_nodes: bool = True):
+        self.spec = spec
+        self.shared_nodes = shared_nodes
+        self.results: Dict[str, List[str]] = {
+            "Structure": [],
+            "References": [],
+            "Paths": [],
+            "Schemas": [],
+            "Security": [],
+        }
+        # Large specs repeat the same few refs hundreds of times
+        self._resolved: Dict[str, bool] = {}
+        # id() of a dict -> True once its subtree has been walked without
+        # errors, False while it is being walked
+        self._seen: Dict[int, bool] = {}
+        self._security_schemes = spec.get("components", {}).get("securitySchemes", {})
+        self._visitors = {
+            "root": self._visit_root,
+            "path_item": self._visit_path_item,
+            "schemas": self._visit_schemas,
+        }
     
-    return errors
-
-
-def validate_paths(spec: Dict) -> List[str]:
-    """Validate path definitions."""
-    errors = []
-    paths = spec.get("paths", {})
+    def run(self) -> Dict[str, List[str]]:
+        """Validate the spec and return errors grouped by category."""
+        self._visit(self.spec, "root", None, "root")
+        return self.results
+    
+    # A node's location is kept as a (parent, key, is_index) chain and only
+    # formatted when a ref fails, instead of building a path string for
+    # every node in the spec.
+    
+    def _visit(self, obj: Dict, name: str, trail, kind: str):
+        """Dispatch a structural node (root, paths, path item, ...) and descend."""
+        visit = self._visitors.get(kind)
+        if visit is not None:
+            visit(name, obj)
+        if "$ref" in obj:
+            self._check_ref(obj["$ref"], trail)
+        
+        # Structural nodes are at most a few levels deep, so plain recursion
+        # is fine here; the bulk of the spec goes through _walk_refs.
+        for key, value in obj.items():
+            child = (trail, key, False)
+            child_kind = "path_item" if kind == "paths" else CHILD_KINDS.get((kind, key))
+            if child_kind is not None and isinstance(value, dict):
+                self._visit(value, key, child, child_kind)
+            elif isinstance(value, (dict, list)):
+                self._walk_refs(value, child)
+    
+    def _walk_refs(self, node, trail):
+        """Check every $ref below a non-structural node."""
+        check_ref = self._check_ref
+        ref_errors = self.results["References"]
+        seen = self._seen
+        
+        # Split into a dict and a list walker that only recurse into
+        # containers and compare classes directly: on CPython 3.11 this
+        # runs faster than an explicit stack, and spec nesting is shallow
+        # enough that recursion depth is not a concern. Children are
+        # visited in order, so errors come out in document order.
+        #
+        def walk_dict_plain(obj, trail):
+            if "$ref" in obj:
+                check_ref(obj["$ref"], trail)
+            for key, value in obj.items():
+                cls = value.__class__
+                if cls is dict:
+                    walk_dict(value, (trail, key, False))
+                elif cls is list:
+                    walk_list(value, (trail, key, False))
+        
+        # YAML anchors (and specs built in code) can share one dict between
+        # many places, or even nest a dict inside itself. A shared subtree
+        # that turned out to have no broken refs is skipped the next time it
+        # is reached; one with errors is walked again so each location is
+        # still reported. Dicts already on the current descent are skipped
+        # so cycles terminate. The bookkeeping slows down the walk of an
+        # unshared spec noticeably, so it is only done when sharing is
+        # possible.
+        def walk_dict_tracked(obj, trail):
+            obj_id = id(obj)
+            if obj_id in seen:
+                return
+            seen[obj_id] = False  # on the current descent
+            error_count = len(ref_errors)
+            
+            walk_dict_plain(obj, trail)
+            
+            if len(ref_errors) == error_count:
+                seen[obj_id] = True  # clean, skip next time
+            else:
+                del seen[obj_id]
+        
+        walk_dict = walk_dict_tracked if self.shared_nodes else walk_dict_plain
+        
+        def walk_list(obj, trail):
+            for i, value in enumerate(obj):
+                cls = value.__class__
+                if cls is dict:
+                    walk_dict(value, (trail, i, True))
+                elif cls is list:
+                    walk_list(value, (trail, i, True))
+        
+        if isinstance(node, dict):
+            walk_dict(node, trail)
+        else:
+            walk_list(node, trail)
+    
+    def _check_ref(self, ref: str, trail):
+        if ref.startswith("#/"):
+            # Validate internal ref
+            ok = self._resolved.get(ref)
+            if ok is None:
+                ok = self._resolved[ref] = _resolve_ref(self.spec, ref)
+            if not ok:
+                self.results["References"].append(
+                    f"{_format_trail(trail)}: Reference not found: {ref}"
+                )
+    
+    def _check_security(self, security: List[Dict], where: str = ""):
+        errors = self.results["Security"]
+        for sec in security:
+            for scheme_name in sec.keys():
+                if scheme_name not in self._security_schemes:
+                    errors.append(f"Undefined security scheme: {scheme_name}{where}")
+    
+    def _visit_root(self, name: str, spec: Dict):
+        """Required top-level fields and global security."""
+        errors = self.results["Structure"]
+        
+        if "openapi" not in spec:
+            errors.append("Missing required field: openapi")
+        elif not spec["openapi"].startswith("3."):
+            errors.append(f"Invalid OpenAPI version: {spec['openapi']} (expected 3.x)")
+        
+        if "info" not in spec:
+            errors.append("Missing required field: info")
+        else:
+            if "title" not in spec["info"]:
+                errors.append("Missing required field: info.title")
+            if "version" not in spec["info"]:
+                errors.append("Missing required field: info.version")
+        
+        if "paths" not in spec:
+            errors.append("Missing required field: paths")
+        
+        self._check_security(spec.get("security", []))
     
-    for path, methods in paths.items():
+    def _visit_path_item(self, path: str, methods: Dict):
+        """Path definitions and operation-level security for one path."""
+        errors = self.results["Paths"]
+        
         # Path should start with /
         if not path.startswith("/"):
             errors.append(f"Path should start with /: {path}")
         
+        # Same for every operation on this path
+        path_params = PATH_PARAM_RE.findall(path)
+        path_level_params = {
+            p.get("name") for p in methods.get("parameters", [])
+            if p.get("in") == "path"
+        }
+        
         for method, operation in methods.items():
-            if method not in ["get", "post", "put", "patch", "delete", "options", "head", "trace", "parameters"]:
-                if method != "$ref":
-                    errors.append(f"Invalid HTTP method: {method} at {path}")
-                continue
+            if isinstance(operation, dict):
+                self._check_security(operation.get("security", []), f" at {method.upper()} {path}")
             
-            if method == "parameters":
+            if method not in HTTP_METHODS:
+                if method != "$ref" and method != "parameters":
+                    errors.append(f"Invalid HTTP method: {method} at {path}")
                 continue
             
             if not isinstance(operation, dict):
@@ -114,86 +268,53 @@ def validate_paths(spec: Dict) -> List[str]:
             if "responses" not in operation:
                 errors.append(f"Missing responses: {method.upper()} {path}")
             else:
-                responses = operation["responses"]
-                if not any(str(code).startswith("2") for code in responses.keys()):
+                for code in operation["responses"]:
+                    # Unquoted YAML status codes load as ints
+                    if code.__class__ is not str:
+                        code = str(code)
+                    if code[:1] == "2":
+                        break
+                else:
                     errors.append(f"No success response (2xx): {method.upper()} {path}")
             
             # Check path params are defined
-            path_params = re.findall(r'\{(\w+)\}', path)
-            defined_params = [
+            defined_params = {
                 p.get("name") for p in operation.get("parameters", [])
                 if p.get("in") == "path" or (
                     "$ref" in p and "Path" in p["$ref"]
                 )
-            ]
+            }
             
             for param in path_params:
                 # Check if defined or inherited from path level
-                path_level_params = [
-                    p.get("name") for p in methods.get("parameters", [])
-                    if p.get("in") == "path"
-                ]
                 if param not in defined_params and param not in path_level_params:
                     errors.append(f"Undefined path parameter: {{{param}}} at {method.upper()} {path}")
     
-    return errors
-
-
-def validate_schemas(spec: Dict) -> List[str]:
-    """Validate component schemas."""
-    errors = []
-    schemas = spec.get("components", {}).get("schemas", {})
-    
-    for name, schema in schemas.items():
-        if not isinstance(schema, dict):
-            errors.append(f"Invalid schema: {name}")
-            continue
+    def _visit_schemas(self, name: str, schemas: Dict):
+        """Component schemas."""
+        errors = self.results["Schemas"]
         
-        # Check type is valid
-        schema_type = schema.get("type")
-        if schema_type and schema_type not in ["string", "number", "integer", "boolean", "array", "object", "null"]:
-            errors.append(f"Invalid schema type: {schema_type} in {name}")
-        
-        # Array should have items
-        if schema_type == "array" and "items" not in schema:
-            errors.append(f"Array schema missing items: {name}")
-        
-        # Object should have properties
-        if schema_type == "object" and "properties" not in schema and "additionalProperties" not in schema:
-            # This is a warning, not error
-            pass
-    
-    return errors
+        for schema_name, schema in schemas.items():
+            if not isinstance(schema, dict):
+                errors.append(f"Invalid schema: {schema_name}")
+                continue
+            
+            # Check type is valid
+            schema_type = schema.get("type")
+            if schema_type and schema_type not in SCHEMA_TYPES:
+                errors.append(f"Invalid schema type: {schema_type} in {schema_name}")
+            
+            # Array should have items
+            if schema_type == "array" and "items" not in schema:
+                errors.append(f"Array schema missing items: {schema_name}")
 
 
-def validate_security(spec: Dict) -> List[str]:
-    """Validate security definitions."""
-    errors = []
-    
-    security_schemes = spec.get("components", {}).get("securitySchemes", {})
-    
-    # Check global security references
-    global_security = spec.get("security", [])
-    for sec in global_security:
-        for scheme_name in sec.keys():
-            if scheme_name not in security_schemes:
-                errors.append(f"Undefined security scheme: {scheme_name}")
-    
-    # Check operation-level security
-    for path, methods in spec.get("paths", {}).items():
-        for method, operation in methods.items():
-            if not isinstance(operation, dict):
-                continue
-            op_security = operation.get("security", [])
-            for sec in op_security:
-                for scheme_name in sec.keys():
-                    if scheme_name not in security_schemes:
-                        errors.append(f"Undefined security scheme: {scheme_name} at {method.upper()} {path}")
-    
-    return errors
+def count_errors(results: Dict) -> int:
+    """Total number of errors across all categories."""
+    return sum(map(len, results.values()))
 
 
-def format_results(results: Dict) -> str:
+def format_results(results: Dict, total_errors: int = None) -> str:
     """Format validation results."""
     lines = []
     
@@ -201,7 +322,8 @@ def format_results(results: Dict) -> str:
     lines.append("OPENAPI VALIDATION RESULTS")
     lines.append("=" * 60)
     
-    total_errors = sum(len(v) for v in results.values())
+    if total_errors is None:
+        total_errors = count_errors(results)
     
     if total_errors == 0:
         lines.append("\n✅ Validation passed! No errors found.")
@@ -211,8 +333,7 @@ def format_results(results: Dict) -> str:
         for category, errors in results.items():
             if errors:
                 lines.append(f"\n{category}:")
-                for error in errors:
-                    lines.append(f"   ❌ {error}")
+                lines.extend([f"   ❌ {error}" for error in errors])
     
     lines.append("\n" + "=" * 60)
     
@@ -238,22 +359,18 @@ def main():
         sys.exit(1)
     
     # Run validations
-    results = {
-        "Structure": validate_structure(spec),
-        "References": validate_refs(spec),
-        "Paths": validate_paths(spec),
-        "Schemas": validate_schemas(spec),
-        "Security": validate_security(spec),
-    }
+    # Only YAML (anchors/aliases) can produce dicts shared between places
+    results = Validator(spec, shared_nodes=input_path.suffix != ".json").run()
+    
+    total_errors = count_errors(results)
     
     # Output
     if "--json" in sys.argv:
         print(json.dumps(results, indent=2))
     else:
-        print(format_results(results))
+        print(format_results(results, total_errors))
     
     # Exit code
-    total_errors = sum(len(v) for v in results.values())
     sys.exit(0 if total_errors == 0 else 1)
 
 
@@ -13,10 +13,16 @@ Output:
 """
 
 import os
+import re
+import fnmatch
 import sys
 import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterable, List, Tuple, Optional
 
 # Files that indicate project type
 PROJECT_INDICATORS = {
@@ -32,18 +38,18 @@ PROJECT_INDICATORS = {
 
 # Framework detection patterns
 FRAMEWORK_PATTERNS = {
-    "express": {"file": "package.json", "contains": '"express"'},
-    "fastify": {"file": "package.json", "contains": '"fastify"'},
-    "nestjs": {"file": "package.json", "contains": '"@nestjs/core"'},
-    "nextjs": {"file": "package.json", "contains": '"next"'},
-    "react": {"file": "package.json", "contains": '"react"'},
-    "vue": {"file": "package.json", "contains": '"vue"'},
-    "angular": {"file": "package.json", "contains": '"@angular/core"'},
-    "django": {"file": "requirements.txt", "contains": "django"},
-    "flask": {"file": "requirements.txt", "contains": "flask"},
-    "fastapi": {"file": "requirements.txt", "contains": "fastapi"},
-    "gin": {"file": "go.mod", "contains": "github.com/gin-gonic/gin"},
-    "echo": {"file": "go.mod", "contains": "github.com/labstack/echo"},
+    "express": {"file": "package.json", "package": "express"},
+    "fastify": {"file": "package.json", "package": "fastify"},
+    "nestjs": {"file": "package.json", "package": "@nestjs/core"},
+    "nextjs": {"file": "package.json", "package": "next"},
+    "react": {"file": "package.json", "package": "react"},
+    "vue": {"file": "package.json", "package": "vue"},
+    "angular": {"file": "package.json", "package": "@angular/core"},
+    "django": {"file": "requirements.txt", "package": "django"},
+    "flask": {"file": "requirements.txt", "package": "flask"},
+    "fastapi": {"file": "requirements.txt", "package": "fastapi"},
+    "gin": {"file": "go.mod", "package": "github.com/gin-gonic/gin"},
+    "echo": {"file": "go.mod", "package": "github.com/labstack/echo"},
 }
 
 # Directory descriptions
@@ -90,11 +96,17 @@ COMMON_DIRECTORIES = {
 }
 
 # Ignore these directories
-IGNORE_DIRS = {
+# Hidden directories are listed explicitly so that useful ones such as
+# .github and .vscode still show up in the tree
+IGNORE_DIRS = frozenset({
     "node_modules", ".git", "__pycache__", ".next", ".nuxt", 
     "dist", "build", "out", ".cache", "coverage", "vendor",
-    ".idea", ".venv", "venv", "env", ".tox"
-}
+    ".idea", ".venv", "venv", "env", ".tox",
+    ".svn", ".hg", ".mypy_cache", ".pytest_cache", ".ruff_cache"
+})
+
+# map_files runs batches smaller than this without a process pool
+PARALLEL_MIN_FILES = 32
 
 
 def detect_project_type(root: Path) -> Tuple[str, List[str]]:
@@ -102,69 +114,268 @@ def detect_project_type(root: Path) -> Tuple[str, List[str]]:
     detected_types = []
     indicator_files = []
     
+    # One listing of the root answers every indicator, including the globs
+    try:
+        names = os.listdir(root)
+    except OSError:
+        names = []
+    present = set(names)
+    
     for project_type, indicators in PROJECT_INDICATORS.items():
         for indicator in indicators:
             if "*" in indicator:
                 # Glob pattern
-                matches = list(root.glob(indicator))
+                matches = [
+                    name for name in names
+                    if not name.startswith(".") and fnmatch.fnmatch(name, indicator)
+                ]
                 if matches:
                     detected_types.append(project_type)
-                    indicator_files.extend([m.name for m in matches])
-            elif (root / indicator).exists():
+                    indicator_files.extend(matches)
+            elif indicator in present:
                 detected_types.append(project_type)
                 indicator_files.append(indicator)
     
     primary_type = detected_types[0] if detected_types else "unknown"
-    return primary_type, list(set(indicator_files))
+    return primary_type, list(dict.fromkeys(indicator_files))
 
 
-def detect_frameworks(root: Path) -> List[str]:
-    """Detect frameworks used in the project."""
-    frameworks = []
+@lru_cache(maxsize=None)
+def load_package_json(root: Path) -> Optional[Dict]:
+    """Parse root/package.json once per run; None if missing or invalid."""
+    try:
+        pkg = json.loads((root / "package.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return pkg if isinstance(pkg, dict) else None
+
+
+@lru_cache(maxsize=None)
+def package_dependencies(root: Path) -> frozenset:
+    """Names listed under dependencies/devDependencies in package.json."""
+    pkg = load_package_json(root) or {}
+    names = set()
+    for key in ("dependencies", "devDependencies"):
+        deps = pkg.get(key)
+        if isinstance(deps, dict):
+            names.update(deps)
+    return frozenset(names)
+
+
+def normalize_requirement_name(spec: str) -> str:
+    """
+    The PEP 503 normalized package name of a requirement specifier.
     
-    for framework, pattern in FRAMEWORK_PATTERNS.items():
-        file_path = root / pattern["file"]
-        if file_path.exists():
-            try:
-                content = file_path.read_text(encoding="utf-8").lower()
-                if pattern["contains"].lower() in content:
-                    frameworks.append(framework)
-            except Exception:
-                pass
+    Extras, markers, version constraints and direct URLs are dropped, so
+    "Flask_SQLAlchemy[async]>=3" gives "flask-sqlalchemy".
+    """
+    name = re.split(r"[\s\[;<>=!~@(]", spec.strip(), maxsplit=1)[0]
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+@lru_cache(maxsize=None)
+def load_requirements(root: Path) -> frozenset:
+    """Normalized package names from root/requirements.txt, without versions."""
+    try:
+        content = (root / "requirements.txt").read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return frozenset()
     
-    return frameworks
+    names = set()
+    for line in content.splitlines():
+        line = line.strip()
+        if not line or line.startswith(("#", "-")):
+            continue
+        names.add(normalize_requirement_name(line))
+    return frozenset(names)
 
 
-def analyze_directory(root: Path, max_depth: int = 3, current_depth: int = 0) -> Dict:
-    """Recursively analyze directory structure."""
-    if current_depth > max_depth:
-        return {"truncated": True}
+@lru_cache(maxsize=None)
+def load_go_modules(root: Path) -> frozenset:
+    """Module paths required by root/go.mod, without major version suffixes."""
+    try:
+        content = (root / "go.mod").read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return frozenset()
     
-    result = {
-        "name": root.name,
+    names = set()
+    in_block = False
+    for line in content.splitlines():
+        line = line.split("//", 1)[0].strip()
+        if in_block:
+            if line == ")":
+                in_block = False
+                continue
+        elif line.startswith("require"):
+            line = line[len("require"):].strip()
+            if line == "(":
+                in_block = True
+                continue
+        else:
+            continue
+        
+        if line:
+            # github.com/labstack/echo/v4 -> github.com/labstack/echo
+            names.add(re.sub(r"/v\d+$", "", line.split()[0]))
+    return frozenset(names)
+
+
+def map_files(func: Callable, paths: List, chunksize: Optional[int] = None) -> Iterable:
+    """
+    Apply func to every path, spreading the work over a process pool.
+    
+    Small batches run serially since starting workers would cost more than
+    it saves. Results keep the order of paths. Without a chunksize, paths
+    are sent to the workers in about four chunks per worker.
+    """
+    if len(paths) < PARALLEL_MIN_FILES:
+        return map(func, paths)
+    
+    workers = os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(paths) // (4 * workers))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, paths, chunksize=chunksize))
+    except (OSError, NotImplementedError, BrokenProcessPool):
+        # No usable multiprocessing support here; run in-process instead
+        return map(func, paths)
+
+
+def detect_frameworks(root: Path) -> List[str]:
+    """Detect frameworks used in the project."""
+    declared = {
+        "package.json": package_dependencies(root),
+        "requirements.txt": load_requirements(root),
+        "go.mod": load_go_modules(root),
+    }
+    
+    return [
+        framework for framework, pattern in FRAMEWORK_PATTERNS.items()
+        if pattern["package"] in declared[pattern["file"]]
+    ]
+
+
+def _new_stats() -> Dict:
+    return {
+        "total_files": 0,
+        "total_dirs": 0,
+        "file_types": Counter()
+    }
+
+
+def _extension(name: str) -> str:
+    """Lowercased extension of a file name, or "no extension"."""
+    dot = name.rfind(".")
+    # dot > 0 leaves dotfiles like .gitignore without an extension
+    return name[dot:].lower() if dot > 0 else "no extension"
+
+
+def _count_entry(entry: os.DirEntry, is_dir: bool, stats: Dict) -> None:
+    """Add one directory entry to the file statistics."""
+    if is_dir:
+        stats["total_dirs"] += 1
+    elif entry.is_file():
+        stats["total_files"] += 1
+        stats["file_types"][_extension(entry.name)] += 1
+
+
+def _count_tree(path: str, stats: Dict) -> None:
+    """Add everything below path to stats without building a tree."""
+    stack = [path]
+    file_types = stats["file_types"]
+    while stack:
+        # Collect a whole directory's extensions and count them in one
+        # Counter.update call, which runs the loop in C
+        extensions = []
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.name in IGNORE_DIRS:
+                        continue
+                    if entry.is_dir():
+                        stats["total_dirs"] += 1
+                        if not entry.is_symlink():
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        extensions.append(_extension(entry.name))
+        except OSError:
+            pass
+        stats["total_files"] += len(extensions)
+        file_types.update(extensions)
+
+
+def _open_directory(path: str, name: str) -> Tuple[Dict, List[os.DirEntry]]:
+    """Build the node for a directory and return its entries, dirs first."""
+    node = {
+        "name": name,
         "type": "directory",
         "children": [],
-        "description": COMMON_DIRECTORIES.get(root.name.lower(), "")
+        "description": COMMON_DIRECTORIES.get(name.lower(), "")
     }
     
     try:
-        items = sorted(root.iterdir(), key=lambda x: (x.is_file(), x.name.lower()))
-        
+        with os.scandir(path) as it:
+            items = sorted(it, key=lambda x: (x.is_file(), x.name.lower()))
+    except PermissionError:
+        node["error"] = "Permission denied"
+        items = []
+    
+    return node, items
+
+
+def analyze_directory(root: Path, max_depth: int = 3, current_depth: int = 0,
+                      stats: Optional[Dict] = None) -> Dict:
+    """
+    Analyze directory structure with an explicit stack instead of recursion.
+    
+    If a stats dict is given, file/directory counts for the whole tree are
+    collected in the same walk: anything deeper than max_depth is still
+    counted, just not added to the structure.
+    """
+    root = str(root)
+    name = os.path.basename(root)
+    if current_depth > max_depth:
+        if stats is not None:
+            _count_tree(root, stats)
+        return {"name": name, "type": "directory", "truncated": True}
+    
+    result, items = _open_directory(root, name)
+    # Each frame resumes its directory where it left off, so entries are
+    # visited (and counted) in the same order as a recursive walk
+    stack = [(iter(items), result, current_depth)]
+    
+    while stack:
+        items, node, depth = stack[-1]
         for item in items:
-            if item.name in IGNORE_DIRS or item.name.startswith("."):
+            if item.name in IGNORE_DIRS:
                 continue
             
-            if item.is_dir():
-                child = analyze_directory(item, max_depth, current_depth + 1)
-                result["children"].append(child)
-            elif current_depth <= 1:  # Only show root-level files
-                result["children"].append({
+            is_dir = item.is_dir()
+            if stats is not None:
+                _count_entry(item, is_dir, stats)
+            
+            if is_dir:
+                if depth + 1 > max_depth:
+                    if stats is not None:
+                        _count_tree(item.path, stats)
+                    node["children"].append(
+                        {"name": item.name, "type": "directory", "truncated": True}
+                    )
+                    continue
+                
+                child, child_items = _open_directory(item.path, item.name)
+                node["children"].append(child)
+                stack.append((iter(child_items), child, depth + 1))
+                break
+            elif depth <= 1:  # Only show root-level files
+                node["children"].append({
                     "name": item.name,
                     "type": "file",
                     "size": item.stat().st_size
                 })
-    except PermissionError:
-        result["error"] = "Permission denied"
+        else:
+            stack.pop()
     
     return result
 
@@ -189,42 +400,34 @@ def find_key_files(root: Path) -> List[Dict]:
         "jest.config.js", "jest.config.ts", "vitest.config.ts",
     ]
     
+    # Every candidate lives in the root, so list it once and reuse the entries
+    try:
+        with os.scandir(root) as it:
+            entries = {entry.name: entry for entry in it}
+    except OSError:
+        return key_files
+    
     for filename in important_files:
-        file_path = root / filename
-        if file_path.exists():
-            key_files.append({
-                "name": filename,
-                "path": str(file_path.relative_to(root)),
-                "size": file_path.stat().st_size
-            })
+        entry = entries.get(filename)
+        if entry is None:
+            continue
+        try:
+            size = entry.stat().st_size
+        except OSError:
+            # Broken symlink
+            continue
+        key_files.append({
+            "name": filename,
+            "path": filename,
+            "size": size
+        })
     
     return key_files
 
 
-def get_stats(root: Path) -> Dict:
-    """Get file statistics for the project."""
-    stats = {
-        "total_files": 0,
-        "total_dirs": 0,
-        "file_types": {}
-    }
-    
-    for item in root.rglob("*"):
-        if any(ignore in str(item) for ignore in IGNORE_DIRS):
-            continue
-        
-        if item.is_file():
-            stats["total_files"] += 1
-            ext = item.suffix.lower() or "no extension"
-            stats["file_types"][ext] = stats["file_types"].get(ext, 0) + 1
-        elif item.is_dir():
-            stats["total_dirs"] += 1
-    
-    # Sort file types by count
-    stats["file_types"] = dict(
-        sorted(stats["file_types"].items(), key=lambda x: x[1], reverse=True)[:10]
-    )
-    
+def top_file_types(stats: Dict, limit: int = 10) -> Dict:
+    """Keep only the most common file types, sorted by count."""
+    stats["file_types"] = dict(stats["file_types"].most_common(limit))
     return stats
 
 
@@ -264,32 +467,29 @@ def format_output(result: Dict) -> str:
     
     # Directory structure
     lines.append(f"\n📁 Directory Structure:")
-    lines.append(format_tree(result["structure"]))
+    format_tree(result["structure"], lines.append)
     
     lines.append("\n" + "=" * 60)
     
     return "\n".join(lines)
 
 
-def format_tree(node: Dict, prefix: str = "", is_last: bool = True) -> str:
-    """Format directory tree as text."""
-    lines = []
-    
+def format_tree(node: Dict, out: Callable[[str], None], prefix: str = "",
+                is_last: bool = True) -> None:
+    """Format directory tree as text, passing each line to out."""
     connector = "└── " if is_last else "├── "
     
     if node.get("type") == "directory":
         desc = f" ({node['description']})" if node.get("description") else ""
-        lines.append(f"{prefix}{connector}📁 {node['name']}{desc}")
+        out(f"{prefix}{connector}📁 {node['name']}{desc}")
         
         children = node.get("children", [])
+        extension = "    " if is_last else "│   "
+        last = len(children) - 1
         for i, child in enumerate(children):
-            is_child_last = (i == len(children) - 1)
-            extension = "    " if is_last else "│   "
-            lines.append(format_tree(child, prefix + extension, is_child_last))
+            format_tree(child, out, prefix + extension, i == last)
     else:
-        lines.append(f"{prefix}{connector}📄 {node['name']}")
-    
-    return "\n".join(lines)
+        out(f"{prefix}{connector}📄 {node['name']}")
 
 
 def main():
@@ -310,9 +510,11 @@ def main():
     # Perform analysis
     project_type, indicator_files = detect_project_type(root)
     frameworks = detect_frameworks(root)
-    structure = analyze_directory(root)
+    # One walk builds the tree and the file statistics
+    stats = _new_stats()
+    structure = analyze_directory(root, stats=stats)
     key_files = find_key_files(root)
-    stats = get_stats(root)
+    top_file_types(stats)
     
     result = {
         "root": str(root),
@@ -15,15 +15,23 @@ Output:
 import os
 import sys
 import re
+import mmap
 import json
 from pathlib import Path
-from typing import Dict, List, Optional
+from collections import defaultdict
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Tuple
 
-IGNORE_DIRS = {
+from analyze_structure import load_package_json, load_requirements, map_files, package_dependencies
+
+IGNORE_DIRS = frozenset({
     "node_modules", ".git", "__pycache__", ".next", ".nuxt",
     "dist", "build", "out", ".cache", "coverage", "vendor",
     ".idea", ".venv", "venv", "env"
-}
+})
+
+# Candidate files sent to a pool worker at a time
+SCAN_CHUNK_SIZE = 32
 
 ENTRY_PATTERNS = {
     "nodejs": {
@@ -98,6 +106,123 @@ ROUTE_PATTERNS = {
 }
 
 
+def combine_patterns(patterns: Dict[str, str]) -> Tuple[re.Pattern, Dict[str, int]]:
+    """
+    Join named patterns into a single alternation so a file is scanned once.
+    
+    match.lastgroup names the branch that fired. Also returns, for each
+    branch, the index of its last own capture group (0 if it has none).
+    """
+    branches = []
+    last_groups = {}
+    offset = 0
+    
+    for name, pattern in patterns.items():
+        inner = re.compile(pattern).groups
+        branches.append(f"(?P<{name}>{pattern})")
+        last_groups[name] = offset + 1 + inner if inner else 0
+        offset += inner + 1
+    
+    return re.compile("|".join(branches).encode()), last_groups
+
+
+# Source files that can hold each framework's route definitions
+SCAN_EXTENSIONS = {
+    "express": (".js", ".ts", ".mjs", ".cjs"),
+    "fastify": (".js", ".ts", ".mjs", ".cjs"),
+    "flask": (".py",),
+    "fastapi": (".py",),
+    "django": (".py",),
+}
+
+# Literals that every match of a pattern set must contain. Files holding
+# none of them cannot match, so they skip the regex pass entirely.
+ENTRY_LITERALS = {
+    "nodejs": (b"express", b"fastify", b"createServer", b".listen", b"export"),
+    "python": (b"Flask", b"FastAPI", b"urlpatterns", b"__name__", b"@click.", b"argparse."),
+    "go": (b"func", b"http.Handle", b"gin.", b"echo.New"),
+}
+
+ROUTE_LITERALS = {
+    "express": (b"app.", b"router."),
+    "fastify": (b"app.", b"fastify."),
+    "flask": (b"@app.route", b"@blueprint.route"),
+    "fastapi": (b"@app.", b"@router."),
+    "django": (b"path", b"url"),
+}
+
+# Files at least this large are memory-mapped rather than read into memory
+MMAP_MIN_SIZE = 1 << 20
+
+# In files that large, entry point declarations are only looked for here
+ENTRY_SCAN_PREFIX = 256 << 10
+
+# Generated bundles that never hold hand-written entry points or routes.
+# walk_files only sees source extensions, so lockfiles and source maps
+# never need listing here.
+SKIP_SUFFIXES = (".min.js", ".bundle.js")
+
+
+def may_match(content, literals: Tuple[bytes, ...], end: Optional[int] = None) -> bool:
+    """Cheap substring prefilter run before the combined regex."""
+    if end is None:
+        end = len(content)
+    # find() rather than `in`: mmap's `in` only tests for a single byte
+    for literal in literals:
+        if content.find(literal, 0, end) != -1:
+            return True
+    return False
+
+
+def read_source(path: str):
+    """
+    Return the raw bytes of a source file for the bytes patterns.
+    
+    All patterns are ASCII, so nothing is decoded up front. Large files
+    are memory-mapped (the caller closes the map); others are read whole.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_MIN_SIZE:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return f.read()
+
+
+COMPILED_ENTRY_PATTERNS = {
+    project_type: combine_patterns(config["patterns"])[0]
+    for project_type, config in ENTRY_PATTERNS.items()
+}
+
+COMPILED_ROUTE_PATTERNS = {
+    framework: combine_patterns({f"route_{i}": p for i, p in enumerate(patterns)})
+    for framework, patterns in ROUTE_PATTERNS.items()
+}
+
+
+def walk_files(root: Path, suffixes: Tuple[str, ...]) -> Iterator[os.DirEntry]:
+    """
+    Yield files under root whose name ends with one of suffixes.
+    
+    Directories named in IGNORE_DIRS are pruned without being entered,
+    and generated files matching SKIP_SUFFIXES are left out.
+    Directories are visited depth-first in listing order, like rglob.
+    """
+    stack = [str(root)]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in IGNORE_DIRS:
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith(suffixes) and not entry.name.endswith(SKIP_SUFFIXES):
+                        yield entry
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+
 def detect_project_type(root: Path) -> str:
     """Detect project type."""
     if (root / "package.json").exists():
@@ -109,6 +234,28 @@ def detect_project_type(root: Path) -> str:
     return "unknown"
 
 
+def expand_main_pattern(root: Path, pattern: str) -> List[str]:
+    """
+    Expand a "dir/*/file" main file pattern into paths relative to root.
+    
+    The only wildcard is a single directory level, so one scandir of dir
+    plus an exists() per subdirectory replaces a general pathlib glob.
+    """
+    prefix, _, name = pattern.partition("/*/")
+    if "*" in prefix or "*" in name:
+        return [str(p.relative_to(root)) for p in root.glob(pattern)]
+    
+    matches = []
+    try:
+        with os.scandir(root / prefix) as it:
+            for entry in it:
+                if entry.is_dir() and os.path.exists(os.path.join(entry.path, name)):
+                    matches.append(os.path.join(prefix, entry.name, name))
+    except OSError:
+        pass
+    return matches
+
+
 def find_main_files(root: Path, project_type: str) -> List[Dict]:
     """Find main/entry point files."""
     results = []
@@ -117,10 +264,9 @@ def find_main_files(root: Path, project_type: str) -> List[Dict]:
     
     for pattern in main_files:
         if "*" in pattern:
-            matches = list(root.glob(pattern))
-            for match in matches:
+            for match in expand_main_pattern(root, pattern):
                 results.append({
-                    "path": str(match.relative_to(root)),
+                    "path": match,
                     "type": "main_file",
                     "reason": "matches pattern: " + pattern
                 })
@@ -135,34 +281,59 @@ def find_main_files(root: Path, project_type: str) -> List[Dict]:
     
     # Check package.json for main/bin
     if project_type == "nodejs":
-        pkg_path = root / "package.json"
-        if pkg_path.exists():
-            try:
-                pkg = json.loads(pkg_path.read_text())
-                if "main" in pkg:
+        pkg = load_package_json(root)
+        if pkg:
+            if "main" in pkg:
+                results.append({
+                    "path": pkg["main"],
+                    "type": "package_main",
+                    "reason": "package.json main field"
+                })
+            if "bin" in pkg:
+                bins = pkg["bin"]
+                if isinstance(bins, str):
                     results.append({
-                        "path": pkg["main"],
-                        "type": "package_main",
-                        "reason": "package.json main field"
+                        "path": bins,
+                        "type": "cli_entry",
+                        "reason": "package.json bin field"
                     })
-                if "bin" in pkg:
-                    bins = pkg["bin"]
-                    if isinstance(bins, str):
+                elif isinstance(bins, dict):
+                    for name, path in bins.items():
                         results.append({
-                            "path": bins,
+                            "path": path,
                             "type": "cli_entry",
-                            "reason": "package.json bin field"
+                            "name": name,
+                            "reason": f"package.json bin: {name}"
                         })
-                    elif isinstance(bins, dict):
-                        for name, path in bins.items():
-                            results.append({
-                                "path": path,
-                                "type": "cli_entry",
-                                "name": name,
-                                "reason": f"package.json bin: {name}"
-                            })
-            except Exception:
-                pass
+    
+    return results
+
+
+def _scan_entry_file(path: str, project_type: str) -> List[Tuple[str, int]]:
+    """Count entry point pattern matches in a single file."""
+    results = []
+    try:
+        content = read_source(path)
+        try:
+            # Entry points are declared near the top; don't scan all of a
+            # multi-megabyte file for them
+            end = len(content)
+            if end >= MMAP_MIN_SIZE:
+                end = ENTRY_SCAN_PREFIX
+            
+            if not may_match(content, ENTRY_LITERALS[project_type], end):
+                return results
+            
+            counts = dict.fromkeys(ENTRY_PATTERNS[project_type]["patterns"], 0)
+            for match in COMPILED_ENTRY_PATTERNS[project_type].finditer(content, 0, end):
+                counts[match.lastgroup] += 1
+        finally:
+            if isinstance(content, mmap.mmap):
+                content.close()
+        
+        results = [(name, count) for name, count in counts.items() if count]
+    except Exception:
+        pass
     
     return results
 
@@ -173,74 +344,80 @@ def scan_for_patterns(root: Path, project_type: str) -> List[Dict]:
     patterns = ENTRY_PATTERNS.get(project_type, {}).get("patterns", {})
     
     extensions = {
-        "nodejs": [".js", ".ts", ".mjs", ".cjs"],
-        "python": [".py"],
-        "go": [".go"]
-    }.get(project_type, [])
+        "nodejs": (".js", ".ts", ".mjs", ".cjs"),
+        "python": (".py",),
+        "go": (".go",)
+    }.get(project_type, ())
     
-    for file_path in root.rglob("*"):
-        if any(ignore in str(file_path) for ignore in IGNORE_DIRS):
-            continue
-        
-        if file_path.suffix not in extensions:
-            continue
-        
+    if not extensions or not patterns:
+        return results
+    
+    paths = [entry.path for entry in walk_files(root, extensions)]
+    scan = partial(_scan_entry_file, project_type=project_type)
+    prefix = len(os.path.join(str(root), ""))
+    for path, file_results in zip(paths, map_files(scan, paths, SCAN_CHUNK_SIZE)):
+        # Paths come from scandir under root, so slicing gives the relative path
+        rel = path[prefix:]
+        for pattern_name, count in file_results:
+            results.append({
+                "path": rel,
+                "type": "pattern_match",
+                "pattern": pattern_name,
+                "matches": count
+            })
+    
+    return results
+
+
+def _scan_route_file(path: str, framework: str) -> List[Tuple[str, str]]:
+    """Extract (route, type) pairs from a single file."""
+    results = []
+    try:
+        content = read_source(path)
         try:
-            content = file_path.read_text(encoding="utf-8", errors="ignore")
+            if not may_match(content, ROUTE_LITERALS[framework]):
+                return results
             
-            for pattern_name, pattern in patterns.items():
-                matches = re.findall(pattern, content)
-                if matches:
-                    results.append({
-                        "path": str(file_path.relative_to(root)),
-                        "type": "pattern_match",
-                        "pattern": pattern_name,
-                        "matches": len(matches) if isinstance(matches[0], str) else len(matches)
-                    })
-        except Exception:
-            pass
+            combined, last_groups = COMPILED_ROUTE_PATTERNS[framework]
+            for match in combined.finditer(content):
+                # The route is the last capture group of the branch that fired
+                route = match.group(last_groups[match.lastgroup] or match.lastgroup)
+                results.append((route.decode("utf-8", errors="ignore"), "route"))
+        finally:
+            if isinstance(content, mmap.mmap):
+                content.close()
+    except Exception:
+        pass
     
     return results
 
 
-def find_routes(root: Path, project_type: str) -> List[Dict]:
-    """Find API route definitions."""
-    results = []
+def find_routes(root: Path, project_type: str) -> Dict[str, List[Tuple[str, str]]]:
+    """Find API route definitions, grouped by file as (route, type) pairs."""
+    results = defaultdict(list)
     
     # Detect framework
     framework = None
-    pkg_path = root / "package.json"
-    req_path = root / "requirements.txt"
+    deps = package_dependencies(root)
+    requirements = load_requirements(root)
     
-    if pkg_path.exists():
-        try:
-            content = pkg_path.read_text().lower()
-            if '"express"' in content:
-                framework = "express"
-            elif '"fastify"' in content:
-                framework = "fastify"
-            elif '"next"' in content:
-                framework = "nextjs_app" if (root / "app").exists() else "nextjs_pages"
-        except Exception:
-            pass
-    
-    if req_path.exists():
-        try:
-            content = req_path.read_text().lower()
-            if "flask" in content:
-                framework = "flask"
-            elif "fastapi" in content:
-                framework = "fastapi"
-            elif "django" in content:
-                framework = "django"
-        except Exception:
-            pass
+    if "express" in deps:
+        framework = "express"
+    elif "fastify" in deps:
+        framework = "fastify"
+    elif "next" in deps:
+        framework = "nextjs_app" if (root / "app").exists() else "nextjs_pages"
+    
+    if "flask" in requirements:
+        framework = "flask"
+    elif "fastapi" in requirements:
+        framework = "fastapi"
+    elif "django" in requirements:
+        framework = "django"
     
     if not framework:
         return results
     
-    patterns = ROUTE_PATTERNS.get(framework, [])
-    
     # Handle Next.js file-based routing
     if framework.startswith("nextjs"):
         if framework == "nextjs_pages" and (root / "pages").exists():
@@ -250,11 +427,7 @@ def find_routes(root: Path, project_type: str) -> List[Dict]:
                 route = route.replace("/index", "").replace("[", ":").replace("]", "")
                 if not route:
                     route = "/"
-                results.append({
-                    "path": str(f.relative_to(root)),
-                    "route": route,
-                    "type": "page"
-                })
+                results[str(f.relative_to(root))].append((route, "page"))
         
         if framework == "nextjs_app" and (root / "app").exists():
             for f in (root / "app").rglob("page.tsx"):
@@ -262,57 +435,37 @@ def find_routes(root: Path, project_type: str) -> List[Dict]:
                 route = route.replace("[", ":").replace("]", "")
                 if route == "/.":
                     route = "/"
-                results.append({
-                    "path": str(f.relative_to(root)),
-                    "route": route,
-                    "type": "page"
-                })
+                results[str(f.relative_to(root))].append((route, "page"))
             
             for f in (root / "app").rglob("route.ts"):
                 route = "/" + str(f.parent.relative_to(root / "app")).replace("\\", "/")
                 route = route.replace("[", ":").replace("]", "")
                 if route == "/.":
                     route = "/"
-                results.append({
-                    "path": str(f.relative_to(root)),
-                    "route": route,
-                    "type": "api_route"
-                })
+                results[str(f.relative_to(root))].append((route, "api_route"))
         
         return results
     
     # Scan files for route patterns
-    extensions = [".js", ".ts", ".py"]
-    
-    for file_path in root.rglob("*"):
-        if any(ignore in str(file_path) for ignore in IGNORE_DIRS):
-            continue
-        
-        if file_path.suffix not in extensions:
-            continue
-        
-        try:
-            content = file_path.read_text(encoding="utf-8", errors="ignore")
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                for match in matches:
-                    if isinstance(match, tuple):
-                        route = match[-1] if len(match) > 1 else match[0]
-                    else:
-                        route = match
-                    
-                    results.append({
-                        "path": str(file_path.relative_to(root)),
-                        "route": route,
-                        "type": "route"
-                    })
-        except Exception:
-            pass
+    paths = [entry.path for entry in walk_files(root, SCAN_EXTENSIONS[framework])]
+    scan = partial(_scan_route_file, framework=framework)
+    prefix = len(os.path.join(str(root), ""))
+    for path, file_results in zip(paths, map_files(scan, paths, SCAN_CHUNK_SIZE)):
+        if file_results:
+            results[path[prefix:]] = file_results
     
     return results
 
 
+def flatten_routes(routes_by_file: Dict[str, List[Tuple[str, str]]]) -> List[Dict]:
+    """Expand grouped routes into one {path, route, type} dict per route."""
+    return [
+        {"path": path, "route": route, "type": route_type}
+        for path, routes in routes_by_file.items()
+        for route, route_type in routes
+    ]
+
+
 def format_output(result: Dict) -> str:
     """Format results as readable text."""
     lines = []
@@ -339,18 +492,12 @@ def format_output(result: Dict) -> str:
     
     # Routes
     if result["routes"]:
-        lines.append(f"\n🛣️  Routes Found ({len(result['routes'])} total):")
-        # Group by file
-        routes_by_file = {}
-        for route in result["routes"]:
-            path = route["path"]
-            if path not in routes_by_file:
-                routes_by_file[path] = []
-            routes_by_file[path].append(route["route"])
+        total = sum(len(routes) for routes in result["routes"].values())
+        lines.append(f"\n🛣️  Routes Found ({total} total):")
         
-        for path, routes in list(routes_by_file.items())[:10]:
+        for path, routes in list(result["routes"].items())[:10]:
             lines.append(f"   📄 {path}")
-            for route in routes[:5]:
+            for route, _ in routes[:5]:
                 lines.append(f"      └─ {route}")
             if len(routes) > 5:
                 lines.append(f"      └─ ... and {len(routes) - 5} more")
@@ -384,6 +531,7 @@ def main():
     }
     
     if "--json" in sys.argv:
+        result["routes"] = flatten_routes(routes)
         print(json.dumps(result, indent=2))
     else:
         print(format_output(result))
@@ -14,16 +14,57 @@ Output:
 
 import os
 import sys
-import json
+from itertools import islice
+from operator import attrgetter
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
 
-IGNORE_DIRS = {
+from analyze_structure import load_package_json, normalize_requirement_name, package_dependencies
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+IGNORE_DIRS = frozenset({
     "node_modules", ".git", "__pycache__", ".next", ".nuxt",
     "dist", "build", "out", ".cache", "coverage", "vendor",
     ".idea", ".venv", "venv", "env"
-}
+})
+
+
+def load_pyproject_dependencies(root: Path) -> Optional[frozenset]:
+    """
+    Normalized names of the dependencies declared in root/pyproject.toml.
+    
+    Covers PEP 621 dependencies and optional-dependencies as well as Poetry's
+    dependency tables. Returns None if the file can't be parsed.
+    """
+    if tomllib is None:
+        return None
+    try:
+        with open(root / "pyproject.toml", "rb") as f:
+            data = tomllib.load(f)
+        
+        project = data.get("project", {})
+        specs = list(project.get("dependencies", []))
+        for extra in project.get("optional-dependencies", {}).values():
+            specs.extend(extra)
+        
+        poetry = data.get("tool", {}).get("poetry", {})
+        tables = [poetry.get("dependencies", {}), poetry.get("dev-dependencies", {})]
+        tables.extend(group.get("dependencies", {}) for group in poetry.get("group", {}).values())
+        for table in tables:
+            specs.extend(table)
+    except Exception:
+        return None
+    
+    names = set()
+    for spec in specs:
+        if isinstance(spec, str):
+            names.add(normalize_requirement_name(spec))
+    return frozenset(names)
 
 
 def detect_project_info(root: Path) -> Dict:
@@ -36,15 +77,14 @@ def detect_project_info(root: Path) -> Dict:
     }
     
     # Try package.json
-    pkg_path = root / "package.json"
-    if pkg_path.exists():
+    pkg = load_package_json(root)
+    if pkg is not None:
         try:
-            pkg = json.loads(pkg_path.read_text())
             info["name"] = pkg.get("name", info["name"])
             info["description"] = pkg.get("description", "")
             info["type"] = "nodejs"
             
-            deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
+            deps = package_dependencies(root)
             if "next" in deps:
                 info["framework"] = "Next.js"
             elif "express" in deps:
@@ -65,12 +105,16 @@ def detect_project_info(root: Path) -> Dict:
     if pyproject.exists():
         info["type"] = "python"
         try:
-            content = pyproject.read_text()
-            if "django" in content.lower():
+            # Match declared dependencies; only fall back to searching the
+            # text when the file can't be parsed
+            deps = load_pyproject_dependencies(root)
+            if deps is None:
+                deps = pyproject.read_text().lower()
+            if "django" in deps:
                 info["framework"] = "Django"
-            elif "fastapi" in content.lower():
+            elif "fastapi" in deps:
                 info["framework"] = "FastAPI"
-            elif "flask" in content.lower():
+            elif "flask" in deps:
                 info["framework"] = "Flask"
         except Exception:
             pass
@@ -118,29 +162,36 @@ def get_directory_tree(root: Path, max_depth: int = 2) -> List[Dict]:
     
     tree = []
     
-    def walk(path: Path, depth: int):
+    prefix = len(os.path.join(str(root), ""))
+    
+    def walk(path: str, depth: int):
         if depth > max_depth:
             return
         
+        # Only directories are listed, so filter before sorting rather than
+        # sorting every file in the directory along with them
         try:
-            for item in sorted(path.iterdir()):
-                if item.name in IGNORE_DIRS or item.name.startswith("."):
-                    continue
-                
-                if item.is_dir():
-                    desc = DESCRIPTIONS.get(item.name.lower(), "")
-                    tree.append({
-                        "name": item.name,
-                        "path": str(item.relative_to(root)),
-                        "type": "directory",
-                        "description": desc,
-                        "depth": depth
-                    })
-                    walk(item, depth + 1)
+            with os.scandir(path) as it:
+                dirs = sorted(
+                    (e for e in it
+                     if e.name not in IGNORE_DIRS and not e.name.startswith(".") and e.is_dir()),
+                    key=attrgetter("name"),
+                )
         except PermissionError:
-            pass
+            return
+        
+        for entry in dirs:
+            desc = DESCRIPTIONS.get(entry.name.lower(), "")
+            tree.append({
+                "name": entry.name,
+                "path": entry.path[prefix:],
+                "type": "directory",
+                "description": desc,
+                "depth": depth
+            })
+            walk(entry.path, depth + 1)
     
-    walk(root, 0)
+    walk(str(root), 0)
     return tree
 
 
@@ -207,9 +258,9 @@ def generate_mermaid_diagram(info: Dict, tree: List[Dict]) -> str:
     diagram.append(f'    ROOT["{info["name"]}"]')
     
     # Group directories by type
-    top_dirs = [d for d in tree if d["depth"] == 0]
+    top_dirs = (d for d in tree if d["depth"] == 0)
     
-    for d in top_dirs[:8]:  # Limit to 8 top-level dirs
+    for d in islice(top_dirs, 8):  # Limit to 8 top-level dirs
         safe_name = d["name"].replace("-", "_").replace(".", "_")
         desc = d["description"] or d["name"]
         diagram.append(f'    {safe_name}["{d["name"]}<br/><small>{desc}</small>"]')
@@ -219,98 +270,91 @@ def generate_mermaid_diagram(info: Dict, tree: List[Dict]) -> str:
     return "\n".join(diagram)
 
 
-def generate_onboarding_guide(root: Path, output_path: str = None) -> str:
-    """Generate the full onboarding guide."""
-    info = detect_project_info(root)
-    tree = get_directory_tree(root)
-    components = find_key_components(root)
-    mermaid = generate_mermaid_diagram(info, tree)
-    
-    lines = []
-    
+def guide_lines(info: Dict, tree: List[Dict], components: List[Dict], mermaid: str) -> Iterator[str]:
+    """Yield the onboarding guide line by line, without line endings."""
     # Header
-    lines.append(f"# {info['name']} - Developer Onboarding Guide")
-    lines.append("")
-    lines.append(f"> Generated on {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    lines.append("")
+    yield f"# {info['name']} - Developer Onboarding Guide"
+    yield ""
+    yield f"> Generated on {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+    yield ""
     
     if info["description"]:
-        lines.append(f"**Description:** {info['description']}")
-        lines.append("")
+        yield f"**Description:** {info['description']}"
+        yield ""
     
-    lines.append(f"**Project Type:** {info['type'].upper()}")
+    yield f"**Project Type:** {info['type'].upper()}"
     if info["framework"]:
-        lines.append(f"**Framework:** {info['framework']}")
-    lines.append("")
+        yield f"**Framework:** {info['framework']}"
+    yield ""
     
     # Architecture
-    lines.append("## Architecture Overview")
-    lines.append("")
-    lines.append(mermaid)
-    lines.append("")
+    yield "## Architecture Overview"
+    yield ""
+    yield mermaid
+    yield ""
     
     # Directory Structure
-    lines.append("## Project Structure")
-    lines.append("")
-    lines.append("```")
+    yield "## Project Structure"
+    yield ""
+    yield "```"
     for d in tree:
         indent = "  " * d["depth"]
         desc = f" # {d['description']}" if d["description"] else ""
-        lines.append(f"{indent}{d['name']}/{desc}")
-    lines.append("```")
-    lines.append("")
+        yield f"{indent}{d['name']}/{desc}"
+    yield "```"
+    yield ""
     
     # Key Components
-    lines.append("## Key Components")
-    lines.append("")
-    lines.append("| File | Description |")
-    lines.append("|------|-------------|")
+    yield "## Key Components"
+    yield ""
+    yield "| File | Description |"
+    yield "|------|-------------|"
     for comp in components:
-        lines.append(f"| `{comp['path']}` | {comp['description']} |")
-    lines.append("")
+        yield f"| `{comp['path']}` | {comp['description']} |"
+    yield ""
     
     # Getting Started
-    lines.append("## Getting Started")
-    lines.append("")
+    yield "## Getting Started"
+    yield ""
     
     if info["type"] == "nodejs":
-        lines.append("### Installation")
-        lines.append("```bash")
-        lines.append("npm install  # or pnpm install / yarn")
-        lines.append("```")
-        lines.append("")
-        lines.append("### Development")
-        lines.append("```bash")
-        lines.append("npm run dev")
-        lines.append("```")
+        yield "### Installation"
+        yield "```bash"
+        yield "npm install  # or pnpm install / yarn"
+        yield "```"
+        yield ""
+        yield "### Development"
+        yield "```bash"
+        yield "npm run dev"
+        yield "```"
     elif info["type"] == "python":
-        lines.append("### Installation")
-        lines.append("```bash")
-        lines.append("pip install -r requirements.txt")
-        lines.append("# or: poetry install / pipenv install")
-        lines.append("```")
-        lines.append("")
-        lines.append("### Development")
-        lines.append("```bash")
-        lines.append("python main.py  # or: python manage.py runserver")
-        lines.append("```")
+        yield "### Installation"
+        yield "```bash"
+        yield "pip install -r requirements.txt"
+        yield "# or: poetry install / pipenv install"
+        yield "```"
+        yield ""
+        yield "### Development"
+        yield "```bash"
+        yield "python main.py  # or: python manage.py runserver"
+        yield "```"
     elif info["type"] == "go":
-        lines.append("### Installation")
-        lines.append("```bash")
-        lines.append("go mod download")
-        lines.append("```")
-        lines.append("")
-        lines.append("### Development")
-        lines.append("```bash")
-        lines.append("go run .")
-        lines.append("```")
-    lines.append("")
+        yield "### Installation"
+        yield "```bash"
+        yield "go mod download"
+        yield "```"
+        yield ""
+        yield "### Development"
+        yield "```bash"
+        yield "go run ."
+        yield "```"
+    yield ""
     
     # Quick Reference
-    lines.append("## Quick Reference")
-    lines.append("")
-    lines.append("### Where to find...")
-    lines.append("")
+    yield "## Quick Reference"
+    yield ""
+    yield "### Where to find..."
+    yield ""
     
     quick_ref = [
         ("API Routes", "src/routes/, app/api/, pages/api/"),
@@ -322,34 +366,52 @@ def generate_onboarding_guide(root: Path, output_path: str = None) -> str:
     ]
     
     for item, locations in quick_ref:
-        lines.append(f"- **{item}:** `{locations}`")
-    lines.append("")
+        yield f"- **{item}:** `{locations}`"
+    yield ""
     
     # Common Tasks
-    lines.append("## Common Tasks")
-    lines.append("")
-    lines.append("### Add a new API endpoint")
-    lines.append("1. Create handler in `src/routes/` or `app/api/`")
-    lines.append("2. Add route definition")
-    lines.append("3. Add tests in `tests/` or `__tests__/`")
-    lines.append("")
-    lines.append("### Add a new feature")
-    lines.append("1. Create service in `src/services/`")
-    lines.append("2. Add types in `src/types/`")
-    lines.append("3. Create UI components in `src/components/`")
-    lines.append("4. Wire up routes")
-    lines.append("5. Add tests")
-    lines.append("")
-    
-    content = "\n".join(lines)
-    
-    # Write to file if output specified
-    if output_path:
-        output_file = root / output_path
-        output_file.write_text(content)
-        print(f"✅ Onboarding guide written to: {output_file}")
-    
-    return content
+    yield "## Common Tasks"
+    yield ""
+    yield "### Add a new API endpoint"
+    yield "1. Create handler in `src/routes/` or `app/api/`"
+    yield "2. Add route definition"
+    yield "3. Add tests in `tests/` or `__tests__/`"
+    yield ""
+    yield "### Add a new feature"
+    yield "1. Create service in `src/services/`"
+    yield "2. Add types in `src/types/`"
+    yield "3. Create UI components in `src/components/`"
+    yield "4. Wire up routes"
+    yield "5. Add tests"
+    yield ""
+
+
+def generate_onboarding_guide(root: Path, output_path: str = None) -> Optional[str]:
+    """
+    Generate the full onboarding guide.
+    
+    With output_path the guide is streamed to root/output_path as it is
+    generated and None is returned; otherwise the guide is returned.
+    """
+    info = detect_project_info(root)
+    tree = get_directory_tree(root)
+    components = find_key_components(root)
+    mermaid = generate_mermaid_diagram(info, tree)
+    lines = guide_lines(info, tree, components, mermaid)
+    
+    if not output_path:
+        return "\n".join(lines)
+    
+    output_file = root / output_path
+    with open(output_file, "w", buffering=1 << 20) as f:
+        # Separators go before each line after the first, so the file ends
+        # exactly like the joined text would
+        f.write(next(lines, ""))
+        for line in lines:
+            f.write("\n")
+            f.write(line)
+    print(f"✅ Onboarding guide written to: {output_file}")
+    return None
 
 
 def main():
@@ -372,7 +434,7 @@ def main():
     
     content = generate_onboarding_guide(root, output)
     
-    if not output:
+    if content is not None:
         print(content)
 
 
@@ -3,7 +3,7 @@
 Trace data flow through a codebase for a specific feature.
 
 Usage:
-    python trace_data_flow.py <path> --feature "user authentication"
+    python trace_data_flow.py <path> --feature "user authentication" [--no-cache]
 
 Output:
     - Input sources (API, CLI, events)
@@ -16,15 +16,29 @@ import os
 import sys
 import re
 import json
+import atexit
+import tempfile
 from pathlib import Path
-from typing import Dict, List, Set
-from collections import defaultdict
+from bisect import bisect_right
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 
-IGNORE_DIRS = {
+from analyze_structure import map_files
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+IGNORE_DIRS = frozenset({
     "node_modules", ".git", "__pycache__", ".next", ".nuxt",
     "dist", "build", "out", ".cache", "coverage", "vendor",
     ".idea", ".venv", "venv", "env"
-}
+})
+
+SOURCE_EXTENSIONS = (".js", ".ts", ".py", ".go", ".tsx", ".jsx")
 
 # Common data flow patterns
 PATTERNS = {
@@ -90,6 +104,106 @@ PATTERNS = {
     }
 }
 
+def _lower_literals(regex: str) -> str:
+    """Lowercase the literal characters of a regex, leaving escapes alone."""
+    # Escapes match as two characters and are returned unchanged (\S != \s)
+    return re.sub(
+        r"\\.|[A-Z]",
+        lambda m: m.group(0) if len(m.group(0)) == 2 else m.group(0).lower(),
+        regex
+    )
+
+
+def _required_literal(regex: str) -> str:
+    """
+    Longest piece of plain text every match of regex must contain.
+    
+    Only text outside groups counts, and a top-level alternation has no
+    required text at all, so "" is returned for those and when unsure.
+    """
+    runs = [""]
+    depth = 0
+    i = 0
+    while i < len(regex):
+        char = regex[i]
+        if char == "\\" and i + 1 < len(regex):
+            escaped = regex[i + 1]
+            if depth == 0 and not escaped.isalnum():
+                runs[-1] += escaped
+            else:
+                runs.append("")
+            i += 2
+            continue
+        if char in "*?{":
+            # The quantified character is optional: drop it from the run
+            runs[-1] = runs[-1][:-1]
+            runs.append("")
+        elif char == "|" and depth == 0:
+            return ""
+        elif char in "([":
+            if char == "[":
+                i = regex.index("]", i + 2)
+            else:
+                depth += 1
+            runs.append("")
+        elif char == ")":
+            depth -= 1
+            runs.append("")
+        elif char in ".^$+":
+            runs.append("")
+        elif depth == 0:
+            runs[-1] += char
+        i += 1
+    return max(runs, key=len)
+
+
+# (required text, pattern) pairs. The text is checked with a plain substring
+# search first, which skips most patterns on most files far more cheaply
+# than letting the regex scan for nothing
+COMPILED_PATTERNS = {
+    category: {
+        pattern_type: [("", re.compile(regex, re.IGNORECASE)) for regex in regexes]
+        for pattern_type, regexes in patterns.items()
+    }
+    for category, patterns in PATTERNS.items()
+}
+
+# The same patterns, case-sensitive, for matching against lowercased text.
+# re.IGNORECASE stops the engine from scanning ahead for a pattern's leading
+# literal, which made each pass roughly ten times slower. The required text is
+# lowercased with them; with IGNORECASE above it would not be reliable.
+FOLDED_PATTERNS = {
+    category: {
+        pattern_type: [
+            (_required_literal(folded), re.compile(folded))
+            for folded in map(_lower_literals, regexes)
+        ]
+        for pattern_type, regexes in patterns.items()
+    }
+    for category, patterns in PATTERNS.items()
+}
+
+IMPORT_PATTERNS = [
+    re.compile(r"import\s+.+\s+from\s+['\"]([^'\"]+)['\"]"),
+    re.compile(r"require\s*\(\s*['\"]([^'\"]+)['\"]\s*\)"),
+    re.compile(r"from\s+(\S+)\s+import"),
+]
+
+# Per-file analyses are kept between runs, keyed by absolute path and
+# validated against the file's mtime and size
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "trace-data-flow"
+CACHE_MAX_ENTRIES = 20_000
+# Bump whenever analyze_data_flow output changes so stale entries are ignored
+CACHE_VERSION = 1
+
+# Threads reading files for the keyword filter, and how far they may get
+# ahead of it
+READ_THREADS = 8
+READ_AHEAD = 64
+
+# A file read once for both stages: (content, lowercased, (mtime_ns, size))
+Source = Tuple[str, str, Tuple[int, int]]
+
 # Feature keywords for common features
 FEATURE_KEYWORDS = {
     "authentication": ["auth", "login", "logout", "token", "jwt", "session", "password", "credential"],
@@ -117,38 +231,262 @@ def parse_feature(feature: str) -> List[str]:
     return words
 
 
-def find_relevant_files(root: Path, keywords: List[str]) -> List[Path]:
-    """Find files related to the feature."""
-    relevant = []
+def walk_source_files(root: Path) -> Iterator[os.DirEntry]:
+    """
+    Yield source files under root, depth-first in listing order like rglob.
     
-    for file_path in root.rglob("*"):
-        if any(ignore in str(file_path) for ignore in IGNORE_DIRS):
-            continue
-        
-        if file_path.suffix not in [".js", ".ts", ".py", ".go", ".tsx", ".jsx"]:
+    Directories in IGNORE_DIRS are pruned without being entered, and
+    symlinked directories are not followed.
+    """
+    stack = [str(root)]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in IGNORE_DIRS:
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith(SOURCE_EXTENSIONS):
+                        yield entry
+        except OSError:
             continue
+        stack.extend(reversed(subdirs))
+
+
+def has_keywords(content: str, keywords: List[str], needed: int) -> bool:
+    """True once `needed` distinct keywords have been found in content."""
+    if needed <= 0:
+        return True
+    for kw in keywords:
+        if kw in content:
+            needed -= 1
+            if not needed:
+                return True
+    return False
+
+
+def read_source(path: str) -> Optional[Source]:
+    """
+    Read a file once for both the keyword filter and the analysis.
+    
+    Returns (content, lowercased content, (mtime_ns, size)) with the stamp
+    taken from the open file before reading, or None if it can't be read.
+    """
+    try:
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            data = f.read()
+    except Exception:
+        return None
+    
+    # Decoding the bytes in one call, and translating newlines only when
+    # there are any, gives the same text as read_text() in about half the
+    # time a text-mode file takes
+    content = data.decode("utf-8", errors="ignore")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content, content.lower(), (st.st_mtime_ns, st.st_size)
+
+
+def find_relevant_files(root: Path, keywords: List[str]) -> List[Tuple[Path, Optional[Source]]]:
+    """
+    Find files related to the feature.
+    
+    Returns (path, source) pairs. source is what read_source() returned when
+    the content had to be checked, so the analysis need not read it again,
+    and None for files selected by their path alone.
+    
+    Files whose path does not already name a keyword are read on a small
+    thread pool, up to READ_AHEAD files ahead of the keyword check, so reads
+    overlap each other and the matching instead of running back to back.
+    """
+    relevant = []
+    # (path, pending read) in walk order; None means the path itself matched
+    window = deque()
+    
+    def settle(file_path: Path, pending: Optional[Future]) -> None:
+        if pending is None:
+            relevant.append((file_path, None))
+            return
+        source = pending.result()
+        if source is not None and has_keywords(source[1], keywords, 2):  # At least 2 keyword matches
+            relevant.append((file_path, source))
+    
+    with ThreadPoolExecutor(max_workers=READ_THREADS) as executor:
+        for entry in walk_source_files(root):
+            path_str = entry.path.lower()
+            
+            # Check if filename contains keywords
+            if any(kw in path_str for kw in keywords):
+                window.append((Path(entry.path), None))
+            else:
+                # Check file content
+                window.append((Path(entry.path), executor.submit(read_source, entry.path)))
+            
+            if len(window) >= READ_AHEAD:
+                settle(*window.popleft())
         
-        path_str = str(file_path).lower()
+        while window:
+            settle(*window.popleft())
+    
+    return relevant
+
+
+def line_starts(content: str) -> List[int]:
+    """Offsets at which each line of content begins."""
+    starts = [0]
+    pos = content.find("\n")
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = content.find("\n", pos + 1)
+    return starts
+
+
+def search_lines(regex: re.Pattern, content: str, starts: List[int]) -> Iterator[Tuple[int, int, int]]:
+    """
+    Yield (line number, start, end) for each line of content regex matches.
+    
+    Searches the whole content instead of every line in turn, then resumes
+    at the next line after a hit. A match that runs past the end of its line
+    is re-checked against that line alone, so results are exactly those of
+    calling regex.search() on each line.
+    """
+    pos = 0
+    index = 0
+    size = len(content)
+    while pos <= size:
+        match = regex.search(content, pos)
+        if match is None:
+            return
         
-        # Check if filename contains keywords
-        if any(kw in path_str for kw in keywords):
-            relevant.append(file_path)
-            continue
+        # Matches only move forward, so the search can start at the last hit
+        index = bisect_right(starts, match.start(), index) - 1
+        line_start = starts[index]
+        line_end = starts[index + 1] - 1 if index + 1 < len(starts) else size
         
-        # Check file content
+        if match.end() <= line_end or regex.search(content, line_start, line_end):
+            yield index + 1, line_start, line_end
+        pos = line_end + 1
+
+
+def _cache_path() -> Path:
+    return CACHE_DIR / f"analyses-v{CACHE_VERSION}.json"
+
+
+def load_cache() -> Dict:
+    """
+    Load the analysis cache and arrange for it to be saved at exit.
+    
+    Returns an empty cache if the file is missing or unreadable.
+    """
+    try:
+        entries = json.loads(_cache_path().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        entries = {}
+    if not isinstance(entries, dict):
+        entries = {}
+    
+    cache = {"entries": entries, "dirty": False}
+    atexit.register(save_cache, cache)
+    return cache
+
+
+def save_cache(cache: Dict) -> None:
+    """Write the cache back if anything changed; failures are ignored."""
+    if not cache["dirty"]:
+        return
+    
+    entries = cache["entries"]
+    # Entries are re-inserted when refreshed, so the oldest come first
+    for path in list(entries)[:max(0, len(entries) - CACHE_MAX_ENTRIES)]:
+        del entries[path]
+    
+    path = _cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
         try:
-            content = file_path.read_text(encoding="utf-8", errors="ignore").lower()
-            matches = sum(1 for kw in keywords if kw in content)
-            if matches >= 2:  # At least 2 keyword matches
-                relevant.append(file_path)
-        except Exception:
-            pass
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        # The cache is an optimization only; never fail the analysis over it
+        pass
+
+
+def cached_analysis(cache: Optional[Dict], file_path: Path, root: Path,
+                    source: Optional[Source] = None) -> Tuple[Optional[Tuple[int, int]], Optional[Dict]]:
+    """
+    Look a file up in the cache.
     
-    return relevant
+    Returns the file's (mtime_ns, size) stamp, taken before any read, and
+    the cached analysis if that stamp still matches (otherwise None).
+    """
+    if cache is None:
+        return None, None
+    if source is not None:
+        stamp = source[2]
+    else:
+        try:
+            st = file_path.stat()
+        except OSError:
+            return None, None
+        stamp = (st.st_mtime_ns, st.st_size)
+    
+    # Stamps come back from JSON as lists
+    cached = cache["entries"].get(str(file_path))
+    if cached is not None and tuple(cached[0]) == stamp:
+        return stamp, {"path": str(file_path.relative_to(root)), **cached[1]}
+    return stamp, None
+
+
+def store_analysis(cache: Optional[Dict], file_path: Path,
+                   stamp: Optional[Tuple[int, int]], result: Dict) -> None:
+    """Remember a fresh analysis, unless it failed or there is no cache."""
+    if cache is None or stamp is None or "error" in result:
+        return
+    
+    key = str(file_path)
+    entries = cache["entries"]
+    # Stored without "path", which depends on the root of this run
+    entries.pop(key, None)
+    entries[key] = (stamp, {k: v for k, v in result.items() if k != "path"})
+    cache["dirty"] = True
 
 
-def analyze_data_flow(file_path: Path, root: Path) -> Dict:
-    """Analyze data flow patterns in a file."""
+def _analyze_item(item: Tuple[Path, Optional[Source]], root: Path) -> Dict:
+    return analyze_data_flow(item[0], root, item[1])
+
+
+def analyze_files(files: List[Tuple[Path, Optional[Source]]], root: Path,
+                  cache: Optional[Dict] = None) -> List[Dict]:
+    """
+    Analyze data flow for many (path, source) pairs, in order.
+    
+    With a cache from load_cache(), files whose mtime and size are unchanged
+    since they were last analyzed are served from it without being read.
+    source, as returned by read_source(), saves reading a file that was
+    already read. The remaining files are spread over a process pool once
+    there are enough of them to be worth it.
+    """
+    lookups = [cached_analysis(cache, path, root, source) for path, source in files]
+    results = [result for _, result in lookups]
+    misses = [i for i, result in enumerate(results) if result is None]
+    
+    analyze = partial(_analyze_item, root=root)
+    for i, result in zip(misses, map_files(analyze, [files[i] for i in misses])):
+        store_analysis(cache, files[i][0], lookups[i][0], result)
+        results[i] = result
+    
+    return results
+
+
+def analyze_data_flow(file_path: Path, root: Path, source: Optional[Source] = None) -> Dict:
+    """Analyze data flow patterns in a file, without the cache."""
     result = {
         "path": str(file_path.relative_to(root)),
         "inputs": [],
@@ -158,44 +496,85 @@ def analyze_data_flow(file_path: Path, root: Path) -> Dict:
     }
     
     try:
-        content = file_path.read_text(encoding="utf-8", errors="ignore")
-        lines = content.split("\n")
+        if source is not None:
+            content, haystack = source[0], source[1]
+        else:
+            content = file_path.read_text(encoding="utf-8", errors="ignore")
+            haystack = content.lower()
+        starts = line_starts(content)
         
-        # Find imports/dependencies
-        import_patterns = [
-            r"import\s+.+\s+from\s+['\"]([^'\"]+)['\"]",
-            r"require\s*\(\s*['\"]([^'\"]+)['\"]\s*\)",
-            r"from\s+(\S+)\s+import",
-        ]
+        # Offsets only carry over if lowercasing kept every character in
+        # place; a few non-ASCII characters expand, so fall back for those
+        compiled = FOLDED_PATTERNS
+        if len(haystack) != len(content):
+            haystack = content
+            compiled = COMPILED_PATTERNS
         
-        for pattern in import_patterns:
-            matches = re.findall(pattern, content)
+        # Find imports/dependencies
+        for pattern in IMPORT_PATTERNS:
+            matches = pattern.findall(content)
             result["dependencies"].extend(matches)
         
         # Analyze patterns
-        for category, patterns in PATTERNS.items():
+        targets = {
+            "input": result["inputs"],
+            "transform": result["transforms"],
+            "output": result["outputs"],
+        }
+        for category, patterns in compiled.items():
+            target = targets[category]
             for pattern_type, regexes in patterns.items():
-                for regex in regexes:
-                    for i, line in enumerate(lines, 1):
-                        if re.search(regex, line, re.IGNORECASE):
-                            entry = {
-                                "type": pattern_type,
-                                "line": i,
-                                "code": line.strip()[:100]
-                            }
-                            
-                            if category == "input":
-                                result["inputs"].append(entry)
-                            elif category == "transform":
-                                result["transforms"].append(entry)
-                            elif category == "output":
-                                result["outputs"].append(entry)
+                for literal, regex in regexes:
+                    if literal not in haystack:
+                        continue
+                    for i, line_start, line_end in search_lines(regex, haystack, starts):
+                        target.append({
+                            "type": pattern_type,
+                            "line": i,
+                            "code": content[line_start:line_end].strip()[:100]
+                        })
     except Exception as e:
         result["error"] = str(e)
     
     return result
 
 
+def _substring_index(paths: List[str]) -> Callable[[str], List[str]]:
+    """
+    Return a lookup of the paths containing a given substring, in order.
+    
+    The paths are joined into one NUL-separated string (NUL can't occur in a
+    path), so each lookup is a few str.find calls over that string instead
+    of a test against every path, and repeated lookups are remembered.
+    """
+    joined = "\0".join(paths)
+    starts = [0]
+    for path in paths[:-1]:
+        starts.append(starts[-1] + len(path) + 1)
+    found: Dict[str, List[str]] = {}
+    
+    def lookup(needle: str) -> List[str]:
+        if needle in found:
+            return found[needle]
+        if not needle:
+            matches = list(paths)
+        elif "\0" in needle:
+            matches = []
+        else:
+            matches = []
+            pos = joined.find(needle)
+            while pos != -1:
+                index = bisect_right(starts, pos) - 1
+                matches.append(paths[index])
+                # Skip to the next path; one hit per path is enough
+                next_start = starts[index + 1] if index + 1 < len(starts) else len(joined)
+                pos = joined.find(needle, next_start)
+        found[needle] = matches
+        return matches
+    
+    return lookup
+
+
 def build_flow_graph(analyses: List[Dict]) -> Dict:
     """Build a data flow graph from file analyses."""
     graph = {
@@ -208,6 +587,8 @@ def build_flow_graph(analyses: List[Dict]) -> Dict:
         }
     }
     
+    containing = _substring_index([analysis["path"] for analysis in analyses])
+    
     for analysis in analyses:
         node = {
             "id": analysis["path"],
@@ -225,17 +606,26 @@ def build_flow_graph(analyses: List[Dict]) -> Dict:
         for dep in analysis.get("dependencies", []):
             if dep.startswith(".") or dep.startswith("@"):
                 # Local dependency
-                for other in analyses:
-                    if dep.replace("./", "").replace("../", "") in other["path"]:
-                        graph["edges"].append({
-                            "from": analysis["path"],
-                            "to": other["path"],
-                            "type": "imports"
-                        })
+                for other in containing(dep.replace("./", "").replace("../", "")):
+                    graph["edges"].append({
+                        "from": analysis["path"],
+                        "to": other,
+                        "type": "imports"
+                    })
     
     return graph
 
 
+def _dumps(obj) -> bytes:
+    """Pretty-print JSON as UTF-8, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
 def format_output(result: Dict) -> str:
     """Format results as readable text."""
     lines = []
@@ -308,20 +698,22 @@ def main():
     
     # Analyze
     keywords = parse_feature(feature)
-    relevant_files = find_relevant_files(root, keywords)
-    analyses = [analyze_data_flow(f, root) for f in relevant_files]
+    relevant = find_relevant_files(root, keywords)
+    cache = None if "--no-cache" in sys.argv else load_cache()
+    analyses = analyze_files(relevant, root, cache)
     graph = build_flow_graph(analyses)
     
     result = {
         "feature": feature,
         "keywords": keywords,
-        "files": [str(f.relative_to(root)) for f in relevant_files],
+        "files": [str(f.relative_to(root)) for f, _ in relevant],
         "analyses": analyses,
         "graph": graph
     }
     
     if "--json" in sys.argv:
-        print(json.dumps(result, indent=2))
+        sys.stdout.flush()
+        sys.stdout.buffer.write(_dumps(result) + b"\n")
     else:
         print(format_output(result))
 
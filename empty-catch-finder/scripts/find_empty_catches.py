@@ -11,8 +11,16 @@ import json
 import os
 import re
 import sys
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # Language configurations
 LANGUAGES = {
@@ -26,51 +34,79 @@ LANGUAGES = {
     '.cs': 'csharp',
 }
 
-# Patterns for each language
+# Patterns for each language. Quantifiers are possessive (*+, ++) wherever
+# the next token can't match what they consumed, so a failed attempt gives up
+# at once instead of backtracking through long runs of whitespace or
+# argument text; the matches are the same as with plain quantifiers.
 PATTERNS = {
     'javascript': [
         # Empty catch: catch (e) {} or catch {}
-        (r'catch\s*\([^)]*\)\s*\{\s*\}', 'empty_catch'),
-        (r'catch\s*\{\s*\}', 'empty_catch'),
+        (r'catch\s*+\([^)]*+\)\s*+\{\s*+\}', 'empty_catch'),
+        (r'catch\s*+\{\s*+\}', 'empty_catch'),
         # Comment-only catch
-        (r'catch\s*\([^)]*\)\s*\{\s*(?://[^\n]*|/\*[^*]*\*/)\s*\}', 'comment_only'),
+        (r'catch\s*+\([^)]*+\)\s*+\{\s*+(?://[^\n]*|/\*[^*]*+\*/)\s*+\}', 'comment_only'),
         # Silent return
-        (r'catch\s*\([^)]*\)\s*\{\s*return\s*(?:null|undefined|false)?\s*;?\s*\}', 'silent_return'),
+        (r'catch\s*+\([^)]*+\)\s*+\{\s*+return\s*+(?:null|undefined|false)?\s*+;?\s*+\}', 'silent_return'),
     ],
     'typescript': [
-        (r'catch\s*\([^)]*\)\s*\{\s*\}', 'empty_catch'),
-        (r'catch\s*\{\s*\}', 'empty_catch'),
-        (r'catch\s*\([^)]*\)\s*\{\s*(?://[^\n]*|/\*[^*]*\*/)\s*\}', 'comment_only'),
-        (r'catch\s*\([^)]*\)\s*\{\s*return\s*(?:null|undefined|false)?\s*;?\s*\}', 'silent_return'),
+        (r'catch\s*+\([^)]*+\)\s*+\{\s*+\}', 'empty_catch'),
+        (r'catch\s*+\{\s*+\}', 'empty_catch'),
+        (r'catch\s*+\([^)]*+\)\s*+\{\s*+(?://[^\n]*|/\*[^*]*+\*/)\s*+\}', 'comment_only'),
+        (r'catch\s*+\([^)]*+\)\s*+\{\s*+return\s*+(?:null|undefined|false)?\s*+;?\s*+\}', 'silent_return'),
     ],
     'python': [
         # except: pass
-        (r'except\s*:\s*pass', 'bare_except_pass'),
+        (r'except\s*+:\s*+pass', 'bare_except_pass'),
         # except Exception: pass
-        (r'except\s+\w+(?:\s+as\s+\w+)?:\s*pass', 'exception_pass'),
+        (r'except\s++\w++(?:\s++as\s++\w++)?:\s*+pass', 'exception_pass'),
         # except Exception: ... (ellipsis)
-        (r'except\s+\w+(?:\s+as\s+\w+)?:\s*\.\.\.', 'exception_ellipsis'),
+        (r'except\s++\w++(?:\s++as\s++\w++)?:\s*+\.\.\.', 'exception_ellipsis'),
     ],
     'java': [
         # Empty catch
-        (r'catch\s*\([^)]+\)\s*\{\s*\}', 'empty_catch'),
+        (r'catch\s*+\([^)]++\)\s*+\{\s*+\}', 'empty_catch'),
         # Comment-only
-        (r'catch\s*\([^)]+\)\s*\{\s*(?://[^\n]*|/\*[^*]*\*/)\s*\}', 'comment_only'),
+        (r'catch\s*+\([^)]++\)\s*+\{\s*+(?://[^\n]*|/\*[^*]*+\*/)\s*+\}', 'comment_only'),
     ],
     'go': [
         # Ignored error with underscore
-        (r',\s*_\s*:?=\s*\w+\([^)]*\)', 'ignored_error'),
+        (r',\s*+_\s*+:?=\s*+\w++\([^)]*+\)', 'ignored_error'),
         # Empty if err != nil
-        (r'if\s+err\s*!=\s*nil\s*\{\s*\}', 'empty_error_check'),
+        (r'if\s++err\s*+!=\s*+nil\s*+\{\s*+\}', 'empty_error_check'),
     ],
     'csharp': [
         # Empty catch
-        (r'catch\s*(?:\([^)]*\))?\s*\{\s*\}', 'empty_catch'),
+        (r'catch\s*+(?:\([^)]*+\))?\s*+\{\s*+\}', 'empty_catch'),
         # Catch-all empty
-        (r'catch\s*\{\s*\}', 'catch_all_empty'),
+        (r'catch\s*+\{\s*+\}', 'catch_all_empty'),
     ],
 }
 
+# Text at least one pattern of the language needs, checked with a plain
+# substring search before any regex runs on the file
+TRIGGERS = {
+    'javascript': ('catch',),
+    'typescript': ('catch',),
+    'python': ('except',),
+    'java': ('catch',),
+    'go': ('_', 'err'),
+    'csharp': ('catch',),
+}
+
+
+def compile_pattern(pattern):
+    """Compile a scan pattern, dropping possessive quantifiers before Python 3.11."""
+    if sys.version_info < (3, 11):
+        pattern = re.sub(r'([*+])\+', r'\1', pattern)
+    return re.compile(pattern, re.MULTILINE | re.DOTALL)
+
+
+# Patterns compiled once at import, as (regex, type) pairs per language
+COMPILED_PATTERNS = {
+    language: [(compile_pattern(pattern), pattern_type) for pattern, pattern_type in patterns]
+    for language, patterns in PATTERNS.items()
+}
+
 # Risk keywords
 HIGH_RISK_KEYWORDS = ['async', 'await', 'database', 'db', 'sql', 'payment', 'transaction', 'save', 'write', 'delete']
 MEDIUM_RISK_KEYWORDS = ['api', 'request', 'response', 'fetch', 'http']
@@ -78,6 +114,15 @@ LOW_RISK_INDICATORS = ['test', 'spec', 'mock', '__test__', 'intentional', 'expec
 
 SKIP_DIRS = {'node_modules', 'vendor', 'venv', '.venv', '__pycache__', '.git', 'dist', 'build'}
 
+# Fewer files than this are scanned without a process pool
+PARALLEL_MIN_FILES = 32
+
+# Larger files are generated or vendored (bundles, lockfiles) and are skipped
+MAX_FILE_SIZE = 2 << 20
+
+# Bytes checked for a NUL to recognize binary files
+BINARY_SNIFF_SIZE = 4096
+
 
 def parse_args():
     parser = argparse.ArgumentParser(description='Find empty catch blocks')
@@ -87,55 +132,148 @@ def parse_args():
     return parser.parse_args()
 
 
-def get_language(file_path):
-    """Determine language from file extension."""
-    return LANGUAGES.get(file_path.suffix.lower())
+def language_for_name(name):
+    """Determine language from a file name's extension."""
+    dot = name.rfind('.')
+    # Same rule as Path.suffix: no suffix for dotfiles or a trailing dot
+    if 0 < dot < len(name) - 1:
+        return LANGUAGES.get(name[dot:].lower())
+    return None
 
 
-def assess_risk(file_path, line_content, context_lines):
-    """Assess risk level of empty catch."""
+def walk_source_files(root):
+    """
+    Yield (path, language) for scannable files under root, like os.walk.
+    
+    Directories are visited top-down in listing order; skipped and hidden
+    directories are pruned and symlinked directories are not followed.
+    """
+    stack = [root]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        if entry.name not in SKIP_DIRS and not entry.name.startswith('.') and not entry.is_symlink():
+                            subdirs.append(entry.path)
+                        continue
+                    language = language_for_name(entry.name)
+                    if language:
+                        yield entry.path, language
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+
+def path_risk_keywords(file_path):
+    """The risk keywords and indicators that occur in a file's path."""
     file_str = str(file_path).lower()
+    return frozenset(
+        word for word in LOW_RISK_INDICATORS + HIGH_RISK_KEYWORDS + MEDIUM_RISK_KEYWORDS
+        if word in file_str
+    )
+
+
+def assess_risk(file_path, line_content, context_lines, path_keywords=None):
+    """
+    Assess risk level of empty catch.
+    
+    path_keywords, from path_risk_keywords(file_path), saves searching the
+    path again for every match in the same file.
+    """
+    if path_keywords is None:
+        path_keywords = path_risk_keywords(file_path)
     content_lower = line_content.lower()
     context_lower = ' '.join(context_lines).lower()
     
     # Low risk indicators
     for indicator in LOW_RISK_INDICATORS:
-        if indicator in file_str or indicator in content_lower:
+        if indicator in path_keywords or indicator in content_lower:
             return 'low', 'In test/intentional context'
     
     # High risk
     for keyword in HIGH_RISK_KEYWORDS:
-        if keyword in context_lower or keyword in file_str:
+        if keyword in path_keywords or keyword in context_lower:
             return 'critical', f'Found in {keyword} context'
     
     # Medium risk
     for keyword in MEDIUM_RISK_KEYWORDS:
-        if keyword in context_lower or keyword in file_str:
+        if keyword in path_keywords or keyword in context_lower:
             return 'high', f'Found in {keyword} context'
     
     return 'medium', 'General code'
 
 
+def line_starts(content):
+    """Offsets at which each line of content begins, for bisecting line numbers."""
+    starts = [0]
+    pos = content.find('\n')
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = content.find('\n', pos + 1)
+    return starts
+
+
+def read_source(file_path, language):
+    """
+    Read a file to scan for the given language.
+    
+    Returns None if it can't be read, is too large or binary, or contains
+    none of the language's trigger text and so can't have any findings.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > MAX_FILE_SIZE:
+                print(f"Warning: Skipping {file_path}: larger than {MAX_FILE_SIZE >> 20} MiB", file=sys.stderr)
+                return None
+            data = f.read()
+    except Exception as e:
+        print(f"Warning: Could not read {file_path}: {e}", file=sys.stderr)
+        return None
+    
+    # A NUL byte near the start means a binary file with a source extension
+    if b'\0' in data[:BINARY_SNIFF_SIZE]:
+        return None
+    
+    # Same text as a text-mode read, without going through one
+    content = data.decode('utf-8', errors='replace')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    
+    # Most files have no catch/except at all; skip them before any regex
+    if not any(trigger in content for trigger in TRIGGERS[language]):
+        return None
+    
+    return content
+
+
 def find_empty_catches_in_file(file_path, language):
     """Find empty catches in a single file."""
     findings = []
-    patterns = PATTERNS.get(language, [])
+    patterns = COMPILED_PATTERNS.get(language, [])
     
     if not patterns:
         return findings
     
-    try:
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-            content = f.read()
-            lines = content.split('\n')
-    except Exception as e:
-        print(f"Warning: Could not read {file_path}: {e}", file=sys.stderr)
+    content = read_source(file_path, language)
+    if content is None:
         return findings
     
-    for pattern, pattern_type in patterns:
-        for match in re.finditer(pattern, content, re.MULTILINE | re.DOTALL):
+    # Lowercased once here rather than per match in assess_risk
+    lines = content.lower().split('\n')
+    starts = line_starts(content)
+    path_keywords = path_risk_keywords(file_path)
+    
+    for regex, pattern_type in patterns:
+        for match in regex.finditer(content):
             # Find line number
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = bisect_right(starts, match.start())
             
             # Get context (5 lines before and after)
             start_line = max(0, line_num - 5)
@@ -143,7 +281,7 @@ def find_empty_catches_in_file(file_path, language):
             context_lines = lines[start_line:end_line]
             
             matched_text = match.group(0)[:100]
-            risk_level, risk_reason = assess_risk(file_path, matched_text, context_lines)
+            risk_level, risk_reason = assess_risk(file_path, matched_text, context_lines, path_keywords)
             
             findings.append({
                 'file': str(file_path),
@@ -158,30 +296,48 @@ def find_empty_catches_in_file(file_path, language):
     return findings
 
 
+def _scan_job(job):
+    """find_empty_catches_in_file for a (file_path, language) pair."""
+    return find_empty_catches_in_file(*job)
+
+
+def map_files(func, jobs):
+    """
+    Apply func to every job, spreading the work over a process pool.
+    
+    Small scans run serially since starting workers would cost more than
+    it saves. Results keep the order of jobs.
+    """
+    if len(jobs) < PARALLEL_MIN_FILES:
+        return map(func, jobs)
+    
+    workers = os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (4 * workers))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, jobs, chunksize=chunksize))
+    except (OSError, NotImplementedError, BrokenProcessPool):
+        # No usable multiprocessing support here; scan in-process instead
+        return map(func, jobs)
+
+
 def find_all_empty_catches(directory, include_low_risk=False):
     """Find all empty catches in directory."""
     findings = []
     root_path = Path(directory).resolve()
     
-    for dirpath, dirnames, filenames in os.walk(root_path):
-        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.')]
-        
-        for filename in filenames:
-            file_path = Path(dirpath) / filename
-            language = get_language(file_path)
+    # Collect the files first so they can be scanned in parallel
+    jobs = list(walk_source_files(str(root_path)))
+    prefix = len(os.path.join(str(root_path), ''))
+    
+    for (file_path, _), file_findings in zip(jobs, map_files(_scan_job, jobs)):
+        for finding in file_findings:
+            finding['file'] = file_path[prefix:]
             
-            if not language:
+            if not include_low_risk and finding['risk'] == 'low':
                 continue
             
-            file_findings = find_empty_catches_in_file(file_path, language)
-            
-            for finding in file_findings:
-                finding['file'] = str(file_path.relative_to(root_path))
-                
-                if not include_low_risk and finding['risk'] == 'low':
-                    continue
-                
-                findings.append(finding)
+            findings.append(finding)
     
     # Sort by risk (critical first)
     risk_order = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
@@ -190,13 +346,23 @@ def find_all_empty_catches(directory, include_low_risk=False):
     return findings
 
 
-def format_text(findings):
-    """Format findings as text."""
+def _dumps(obj):
+    """Pretty-print JSON as UTF-8 bytes, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def text_lines(findings):
+    """Yield the text report line by line, without line endings."""
     if not findings:
-        return "No empty catch blocks found."
+        yield "No empty catch blocks found."
+        return
     
-    output = []
-    output.append(f"Found {len(findings)} empty catch blocks\n")
+    yield f"Found {len(findings)} empty catch blocks\n"
     
     # Group by risk
     by_risk = {'critical': [], 'high': [], 'medium': [], 'low': []}
@@ -213,13 +379,11 @@ def format_text(findings):
     for risk in ['critical', 'high', 'medium', 'low']:
         items = by_risk[risk]
         if items:
-            output.append(f"\n{labels[risk]} ({len(items)})\n")
+            yield f"\n{labels[risk]} ({len(items)})\n"
             for f in items:
-                output.append(f"  {f['file']}:{f['line']}")
-                output.append(f"    Type: {f['type']} | {f['risk_reason']}")
-                output.append(f"    Code: {f['content'][:60]}")
-    
-    return '\n'.join(output)
+                yield f"  {f['file']}:{f['line']}"
+                yield f"    Type: {f['type']} | {f['risk_reason']}"
+                yield f"    Code: {f['content'][:60]}"
 
 
 def main():
@@ -234,9 +398,14 @@ def main():
     findings = find_all_empty_catches(directory, args.include_low_risk)
     
     if args.format == 'json':
-        print(json.dumps(findings, indent=2))
+        sys.stdout.flush()
+        sys.stdout.buffer.write(_dumps(findings) + b'\n')
     else:
-        print(format_text(findings))
+        # Write as the report is produced rather than joining it first
+        write = sys.stdout.write
+        for line in text_lines(findings):
+            write(line)
+            write('\n')
 
 
 if __name__ == '__main__':
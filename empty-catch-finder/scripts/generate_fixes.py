@@ -9,10 +9,12 @@ Usage: python generate_fixes.py <directory> [--output fixes.md]
 import argparse
 import json
 import os
-import re
 import sys
+from bisect import bisect_right
 from pathlib import Path
 
+from find_empty_catches import COMPILED_PATTERNS, line_starts, map_files, read_source, walk_source_files
+
 
 # Fix templates by language and type
 FIX_TEMPLATES = {
@@ -112,18 +114,6 @@ catch (Exception ex) {{
     },
 }
 
-# Import finding logic from find_empty_catches
-LANGUAGES = {'.js': 'javascript', '.jsx': 'javascript', '.ts': 'typescript', '.tsx': 'typescript', '.py': 'python', '.java': 'java', '.go': 'go', '.cs': 'csharp'}
-PATTERNS = {
-    'javascript': [(r'catch\s*\([^)]*\)\s*\{\s*\}', 'empty_catch'), (r'catch\s*\([^)]*\)\s*\{\s*return\s*(?:null|undefined|false)?\s*;?\s*\}', 'silent_return')],
-    'typescript': [(r'catch\s*\([^)]*\)\s*\{\s*\}', 'empty_catch')],
-    'python': [(r'except\s*:\s*pass', 'bare_except_pass'), (r'except\s+\w+(?:\s+as\s+\w+)?:\s*pass', 'exception_pass')],
-    'java': [(r'catch\s*\([^)]+\)\s*\{\s*\}', 'empty_catch')],
-    'go': [(r',\s*_\s*:?=\s*\w+\([^)]*\)', 'ignored_error'), (r'if\s+err\s*!=\s*nil\s*\{\s*\}', 'empty_error_check')],
-    'csharp': [(r'catch\s*(?:\([^)]*\))?\s*\{\s*\}', 'empty_catch')],
-}
-SKIP_DIRS = {'node_modules', 'vendor', 'venv', '.git', 'dist', 'build'}
-
 
 def parse_args():
     parser = argparse.ArgumentParser(description='Generate fix suggestions')
@@ -132,49 +122,52 @@ def parse_args():
     return parser.parse_args()
 
 
+def scan_file(job):
+    """Issues in one file, for a (file_path, lang) job."""
+    file_path, lang = job
+    findings = []
+    
+    content = read_source(file_path, lang)
+    if content is None:
+        return findings
+    
+    starts = line_starts(content)
+    for regex, ptype in COMPILED_PATTERNS[lang]:
+        for match in regex.finditer(content):
+            findings.append({
+                'file': file_path,
+                'line': bisect_right(starts, match.start()),
+                'type': ptype,
+                'language': lang,
+                'content': match.group(0)[:80],
+            })
+    
+    return findings
+
+
 def find_issues(directory):
-    """Simplified issue finder."""
+    """Simplified issue finder, using the patterns of find_empty_catches."""
     findings = []
-    root = Path(directory).resolve()
+    root = str(Path(directory).resolve())
+    prefix = len(os.path.join(root, ''))
     
-    for dirpath, dirnames, filenames in os.walk(root):
-        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
-        
-        for filename in filenames:
-            file_path = Path(dirpath) / filename
-            lang = LANGUAGES.get(file_path.suffix.lower())
-            if not lang or lang not in PATTERNS:
-                continue
-            
-            try:
-                content = file_path.read_text(encoding='utf-8', errors='replace')
-            except:
-                continue
-            
-            for pattern, ptype in PATTERNS[lang]:
-                for match in re.finditer(pattern, content):
-                    line = content[:match.start()].count('\n') + 1
-                    findings.append({
-                        'file': str(file_path.relative_to(root)),
-                        'line': line,
-                        'type': ptype,
-                        'language': lang,
-                        'content': match.group(0)[:80],
-                    })
+    for file_findings in map_files(scan_file, list(walk_source_files(root))):
+        for finding in file_findings:
+            finding['file'] = finding['file'][prefix:]
+            findings.append(finding)
     
     return findings
 
 
-def generate_report(findings, directory):
-    """Generate markdown fix report."""
-    lines = []
-    lines.append("# Empty Catch Block Fixes\n")
-    lines.append(f"**Scanned:** {directory}")
-    lines.append(f"**Issues found:** {len(findings)}\n")
+def report_lines(findings, directory):
+    """Yield the markdown fix report line by line, without line endings."""
+    yield "# Empty Catch Block Fixes\n"
+    yield f"**Scanned:** {directory}"
+    yield f"**Issues found:** {len(findings)}\n"
     
     if not findings:
-        lines.append("No empty catch blocks found!")
-        return '\n'.join(lines)
+        yield "No empty catch blocks found!"
+        return
     
     # Group by language
     by_lang = {}
@@ -185,28 +178,36 @@ def generate_report(findings, directory):
         by_lang[lang].append(f)
     
     for lang, items in by_lang.items():
-        lines.append(f"\n## {lang.title()} ({len(items)} issues)\n")
+        yield f"\n## {lang.title()} ({len(items)} issues)\n"
         
         for f in items:
-            lines.append(f"### {f['file']}:{f['line']}\n")
-            lines.append(f"**Found:** `{f['content']}`\n")
+            yield f"### {f['file']}:{f['line']}\n"
+            yield f"**Found:** `{f['content']}`\n"
             
             # Get fix template
             fix = FIX_TEMPLATES.get(lang, {}).get(f['type'], 'Add proper error handling.')
-            lines.append("**Suggested fix:**\n")
-            lines.append(f"```{lang}")
-            lines.append(fix)
-            lines.append("```\n")
+            yield "**Suggested fix:**\n"
+            yield f"```{lang}"
+            yield fix
+            yield "```\n"
     
     # Summary
-    lines.append("\n## Next Steps\n")
-    lines.append("1. Review each issue and apply appropriate fix")
-    lines.append("2. Add linting rules to prevent new issues:")
-    lines.append("   - ESLint: `no-empty` rule")
-    lines.append("   - Python: `E722` (bare except)")
-    lines.append("3. Consider adding structured logging (Winston, Pino, etc.)")
-    
-    return '\n'.join(lines)
+    yield "\n## Next Steps\n"
+    yield "1. Review each issue and apply appropriate fix"
+    yield "2. Add linting rules to prevent new issues:"
+    yield "   - ESLint: `no-empty` rule"
+    yield "   - Python: `E722` (bare except)"
+    yield "3. Consider adding structured logging (Winston, Pino, etc.)"
+
+
+def write_report(findings, directory, fp):
+    """Write the markdown fix report to fp as it is generated."""
+    lines = report_lines(findings, directory)
+    # Lines are joined with newlines; the report ends without a trailing one
+    fp.write(next(lines, ''))
+    for line in lines:
+        fp.write('\n')
+        fp.write(line)
 
 
 def main():
@@ -215,10 +216,9 @@ def main():
     print(f"Scanning {args.directory}...", file=sys.stderr)
     findings = find_issues(args.directory)
     
-    report = generate_report(findings, args.directory)
-    
     output_path = Path(args.output)
-    output_path.write_text(report, encoding='utf-8')
+    with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as fp:
+        write_report(findings, args.directory, fp)
     
     print(f"Report written to {output_path}", file=sys.stderr)
     print(f"Found {len(findings)} issues", file=sys.stderr)
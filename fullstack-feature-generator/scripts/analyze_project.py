@@ -19,6 +19,11 @@ import re
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 IGNORE_DIRS = {
     "node_modules", ".git", "__pycache__", ".next", ".nuxt",
     "dist", "build", "out", ".cache", "coverage", "vendor",
@@ -47,6 +52,13 @@ def detect_package_manager(root: Path) -> Optional[str]:
     return None
 
 
+def _loads(data: bytes):
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def detect_frameworks(root: Path) -> Dict[str, str]:
     """Detect API, ORM, and UI frameworks."""
     frameworks = {
@@ -61,7 +73,7 @@ def detect_frameworks(root: Path) -> Dict[str, str]:
     pkg_path = root / "package.json"
     if pkg_path.exists():
         try:
-            pkg = json.loads(pkg_path.read_text())
+            pkg = _loads(pkg_path.read_bytes())
             deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
             
             # API frameworks
@@ -183,11 +195,13 @@ def detect_naming_convention(root: Path) -> Dict[str, str]:
         "variables": "unknown",
     }
     
-    # Sample some TypeScript/JavaScript files
+    # Sample the first TypeScript/JavaScript file; glob is lazy, so taking
+    # one match with next() stops the walk there instead of listing src/
+    src = root / "src"
     for ext in ["*.ts", "*.js"]:
-        files = list((root / "src").glob(f"**/{ext}"))[:5] if (root / "src").exists() else []
+        f = next(src.glob(f"**/{ext}"), None) if src.exists() else None
         
-        for f in files:
+        if f is not None:
             name = f.stem
             if "-" in name:
                 conventions["files"] = "kebab-case"
@@ -197,40 +211,63 @@ def detect_naming_convention(root: Path) -> Dict[str, str]:
                 conventions["files"] = "PascalCase"
             else:
                 conventions["files"] = "camelCase"
-            break
     
     return conventions
 
 
+# (directory name, extension, example type) for files that show how an
+# existing feature is built; listed in the order examples are reported
+EXAMPLE_LOCATIONS = [
+    ("routes", ".ts", "api"),
+    ("controllers", ".ts", "api"),
+    ("routes", ".py", "api"),
+    ("models", ".ts", "model"),
+    ("schema", ".ts", "model"),
+    ("models", ".py", "model"),
+]
+
+
 def find_example_features(root: Path) -> List[Dict]:
-    """Find existing features to use as examples."""
+    """
+    Find existing features to use as examples.
+    
+    One walk of the tree sorts files into EXAMPLE_LOCATIONS, rather than a
+    recursive glob per location.
+    """
     examples = []
+    top = str(root)
     
-    # Look for route/controller files
-    for pattern in ["**/routes/*.ts", "**/controllers/*.ts", "**/routes/*.py"]:
-        for f in root.glob(pattern):
-            if any(ignore in str(f) for ignore in IGNORE_DIRS):
-                continue
-            
-            name = f.stem.replace(".routes", "").replace(".controller", "").replace("_routes", "")
-            if name not in ["index", "__init__"]:
-                examples.append({
-                    "name": name,
-                    "type": "api",
-                    "path": str(f.relative_to(root))
-                })
+    # Preorder index of each visited directory; a recursive glob reports
+    # <dir>/routes/* when it reaches <dir>, so hits are ordered by that
+    order = {}
+    found = [[] for _ in EXAMPLE_LOCATIONS]
     
-    # Look for model files
-    for pattern in ["**/models/*.ts", "**/schema/*.ts", "**/models/*.py"]:
-        for f in root.glob(pattern):
-            if any(ignore in str(f) for ignore in IGNORE_DIRS):
-                continue
+    for dirpath, dirnames, filenames in os.walk(top):
+        dirnames[:] = [d for d in dirnames if d not in IGNORE_DIRS]
+        order[dirpath] = len(order)
+        if dirpath == top:
+            continue
+        
+        parent, name = os.path.split(dirpath)
+        for hits, (dir_name, ext, _) in zip(found, EXAMPLE_LOCATIONS):
+            if name == dir_name:
+                hits.extend((order[parent], os.path.join(dirpath, f)) for f in filenames if f.endswith(ext))
+    
+    for hits, (_, _, example_type) in zip(found, EXAMPLE_LOCATIONS):
+        hits.sort(key=lambda hit: hit[0])
+        for _, path in hits:
+            f = Path(path)
+            if example_type == "api":
+                name = f.stem.replace(".routes", "").replace(".controller", "").replace("_routes", "")
+                skip = ["index", "__init__"]
+            else:
+                name = f.stem
+                skip = ["index", "__init__", "base"]
             
-            name = f.stem
-            if name not in ["index", "__init__", "base"]:
+            if name not in skip:
                 examples.append({
                     "name": name,
-                    "type": "model",
+                    "type": example_type,
                     "path": str(f.relative_to(root))
                 })
     